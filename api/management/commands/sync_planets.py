@@ -17,6 +17,11 @@ class Command(BaseCommand):
         parser.add_argument(
             "--verbose", action="store_true", help="Enable verbose output"
         )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Re-sync every planet, ignoring the incremental sync cursor",
+        )
 
     def handle(self, *args, **options):
         if options["verbose"]:
@@ -29,7 +34,7 @@ class Command(BaseCommand):
                 self.show_status(sync_service)
                 return
 
-            self.sync_all_planets(sync_service)
+            self.sync_all_planets(sync_service, full=options["full"])
 
         except Exception as e:
             raise CommandError(f"Sync failed: {e}")
@@ -45,15 +50,16 @@ class Command(BaseCommand):
         )
         self.stdout.write(f"Last sync time: {status['last_sync_time'] or 'Never'}")
 
-    def sync_all_planets(self, sync_service):
+    def sync_all_planets(self, sync_service, full=False):
         """Sync all planets."""
         self.stdout.write("Starting planet synchronization...")
 
-        stats = sync_service.sync_planets()
+        stats = sync_service.sync_planets(full=full)
 
         self.stdout.write(self.style.SUCCESS("=== Sync Completed ==="))
         self.stdout.write(f"Created: {stats['created']}")
         self.stdout.write(f"Updated: {stats['updated']}")
+        self.stdout.write(f"Unchanged: {stats['unchanged']}")
         self.stdout.write(f"Errors: {stats['errors']}")
         self.stdout.write(f"Total processed: {stats['total_processed']}")
 
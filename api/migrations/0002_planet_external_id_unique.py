@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-15 05:49
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def clear_blank_and_duplicate_external_ids(apps, schema_editor):
+    """
+    Make existing external_ids satisfy the unique constraint.
+    Blank ids become NULL; of each duplicated id, only the most recently
+    updated planet keeps it and the others are set to NULL.
+    """
+    Planet = apps.get_model("api", "Planet")
+    Planet.objects.filter(external_id="").update(external_id=None)
+
+    duplicated = (
+        Planet.objects.exclude(external_id=None)
+        .values("external_id")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .values_list("external_id", flat=True)
+    )
+    for external_id in list(duplicated):
+        keep = (
+            Planet.objects.filter(external_id=external_id)
+            .order_by("-updated_at", "-id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        Planet.objects.filter(external_id=external_id).exclude(id=keep).update(external_id=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_blank_and_duplicate_external_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="planet",
+            name="external_id",
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-15 05:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_planet_external_id_unique"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="planet",
+            index=models.Index(fields=["-updated_at"], name="planets_updated_at_desc_idx"),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-15 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_sync_cursor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="planet",
+            name="content_hash",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=16),
+        ),
+    ]
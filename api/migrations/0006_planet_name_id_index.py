@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-15 06:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_planet_content_hash"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="planet",
+            index=models.Index(fields=["name", "id"], name="planets_name_id_idx"),
+        ),
+    ]
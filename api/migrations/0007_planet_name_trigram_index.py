@@ -0,0 +1,31 @@
+from django.db import migrations
+
+# Trigram index on UPPER(name), the expression Django's icontains lookup
+# compares on PostgreSQL, so name searches can use it instead of a full scan.
+CREATE_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS planets_name_upper_trgm_idx "
+    "ON planets USING gin (UPPER(name) gin_trgm_ops)",
+]
+DROP_SQL = ["DROP INDEX IF EXISTS planets_name_upper_trgm_idx"]
+
+
+def _run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_planet_name_id_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(_run_on_postgresql(CREATE_SQL), _run_on_postgresql(DROP_SQL)),
+    ]
@@ -4,13 +4,19 @@ from django.db import models
 class Planet(models.Model):
     class Meta:
         db_table = "planets"
+        indexes = [
+            models.Index(fields=["-updated_at"], name="planets_updated_at_desc_idx"),
+            models.Index(fields=["name", "id"], name="planets_name_id_idx"),
+        ]
 
     id = models.AutoField(primary_key=True)
-    external_id = models.CharField(max_length=255, db_index=True, null=True, blank=True)
+    external_id = models.CharField(max_length=255, unique=True, null=True, blank=True)
     name = models.CharField(max_length=255)
     population = models.IntegerField()
     climates = models.JSONField(default=list)
     terrains = models.JSONField(default=list)
+    # Digest of the upstream payload last synced into this row
+    content_hash = models.CharField(max_length=16, blank=True, default="", db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -38,3 +44,15 @@ class Planet(models.Model):
     def get_terrains_display(self):
         """Get terrains as a comma-separated string for display"""
         return ', '.join(self.terrains) if self.terrains else ''
+
+
+class SyncCursor(models.Model):
+    class Meta:
+        db_table = "sync_cursors"
+
+    name = models.CharField(max_length=100, unique=True)
+    cursor = models.CharField(max_length=255, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.cursor or 'none'}"
@@ -0,0 +1,105 @@
+from functools import partial
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+from .models import Planet
+
+PLANET_COUNT_CACHE_KEY = "planet_count"
+PLANET_LIST_VERSION_CACHE_KEY = "planet_list_version"
+
+
+def cached_planet_count():
+    """Return the total number of planets, cached like the unfiltered list count."""
+    return cache.get_or_set(
+        PLANET_COUNT_CACHE_KEY, Planet.objects.count, settings.PLANET_COUNT_CACHE_TIMEOUT
+    )
+
+
+def planet_list_version():
+    """
+    Return a token that changes whenever a planet is created or deleted.
+    A fresh token is drawn after every invalidation, so an evicted version
+    never comes back with an old value.
+    """
+    return cache.get_or_set(PLANET_LIST_VERSION_CACHE_KEY, lambda: uuid.uuid4().hex[:12], None)
+
+
+def invalidate_planet_count():
+    """Drop the cached planet count and list version so both are rebuilt on the next list."""
+    cache.delete_many([PLANET_COUNT_CACHE_KEY, PLANET_LIST_VERSION_CACHE_KEY])
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that reads its total count from the cache when given a key.
+    Without a key it counts the object list like Django's Paginator.
+    """
+
+    def __init__(self, object_list, per_page, count_cache_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_cache_key = count_cache_key
+
+    @cached_property
+    def count(self):
+        """Return the total number of objects, cached under count_cache_key if set."""
+        if self.count_cache_key is None:
+            return super().count
+
+        return cache.get_or_set(
+            self.count_cache_key,
+            self.object_list.count,
+            settings.PLANET_COUNT_CACHE_TIMEOUT,
+        )
+
+
+class PlanetCursorPagination(CursorPagination):
+    """
+    Cursor pagination ordered by (name, id).
+    DRF's cursor only holds the last page's name, not a full (name, id) key:
+    each page seeks to name >= that value on the (name, id) index and skips
+    the rows sharing it with an offset kept in the cursor. Deep pages stay
+    cheap, but a name shared by many planets still costs a scan of those rows.
+    """
+
+    ordering = ("name", "id")
+
+
+class PlanetPagination(PageNumberPagination):
+    """
+    Page number pagination that caches the COUNT(*) of the unfiltered planet list.
+    Searches are always counted exactly.
+
+    Pages are sliced over primary keys and only the rows on the page are loaded.
+    Requests carrying a `cursor` parameter use PlanetCursorPagination instead.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param in request.query_params:
+            self.cursor_paginator = PlanetCursorPagination()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        self.cursor_paginator = None
+
+        search = request.query_params.get("search", "").strip()
+        count_cache_key = None if search else PLANET_COUNT_CACHE_KEY
+        self.django_paginator_class = partial(CachedCountPaginator, count_cache_key=count_cache_key)
+
+        # Skipped rows are read from the (name, id) index instead of the full table
+        page = super().paginate_queryset(queryset.values_list("pk", flat=True), request, view)
+        if page is None:
+            return None
+
+        planets = queryset.in_bulk(page)
+        return [planets[pk] for pk in page if pk in planets]
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -1,6 +1,9 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from .models import Planet
 
+EXTERNAL_ID_EXISTS_MESSAGE = "A planet with this external_id already exists."
+
 
 class PlanetSerializer(serializers.ModelSerializer):
     """
@@ -35,6 +38,48 @@ class PlanetListSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
+class PlanetLiteSerializer(serializers.ModelSerializer):
+    """
+    Minimal serializer for lite planet list views.
+    Excludes climates and terrains to keep list payloads small.
+    """
+
+    class Meta:
+        model = Planet
+        fields = ["id", "external_id", "name", "population"]
+        read_only_fields = ["id"]
+
+
+class PlanetListCreateSerializer(serializers.ListSerializer):
+    """
+    List serializer for creating several planets at once.
+    Prefetches taken external_ids in one query so items skip their own lookup.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            external_ids = {
+                item.get("external_id")
+                for item in data
+                if isinstance(item, dict) and item.get("external_id")
+            }
+            self.existing_external_ids = set(
+                Planet.objects.filter(external_id__in=external_ids).values_list(
+                    "external_id", flat=True
+                )
+            )
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        """Validate external_ids are not repeated within the batch."""
+        external_ids = [item["external_id"] for item in attrs if item.get("external_id")]
+        if len(external_ids) != len(set(external_ids)):
+            raise serializers.ValidationError(
+                "Each planet in the batch must have a distinct external_id."
+            )
+        return attrs
+
+
 class PlanetCreateUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating and updating planets.
@@ -53,6 +98,7 @@ class PlanetCreateUpdateSerializer(serializers.ModelSerializer):
         model = Planet
         fields = ["id", "external_id", "name", "population", "climates", "terrains"]
         read_only_fields = ["id"]
+        list_serializer_class = PlanetListCreateSerializer
 
     def validate_population(self, value):
         """Validate population is non-negative."""
@@ -67,9 +113,42 @@ class PlanetCreateUpdateSerializer(serializers.ModelSerializer):
         return value.strip()
 
     def validate_external_id(self, value):
-        """Validate external_id is unique if provided."""
+        """
+        Validate external_id is unique if provided.
+        A blank id is stored as NULL, so any number of planets can omit it.
+        """
+        if value == "":
+            return None
         if value:
+            existing = getattr(self.parent, "existing_external_ids", None)
+            if existing is not None:
+                if value in existing:
+                    raise serializers.ValidationError(EXTERNAL_ID_EXISTS_MESSAGE)
+                return value
+
             instance = getattr(self, 'instance', None)
             if Planet.objects.filter(external_id=value).exclude(pk=instance.pk if instance else None).exists():
-                raise serializers.ValidationError("A planet with this external_id already exists.")
+                raise serializers.ValidationError(EXTERNAL_ID_EXISTS_MESSAGE)
         return value
+
+    def create(self, validated_data):
+        return self._save_guarded(super().create, validated_data)
+
+    def update(self, instance, validated_data):
+        # Local edits diverge from the synced payload, so the next sync rewrites them
+        validated_data["content_hash"] = ""
+        return self._save_guarded(super().update, instance, validated_data)
+
+    def _save_guarded(self, save, *args):
+        """
+        Run a save against the unique external_id constraint.
+        A concurrent write that slips past validate_external_id surfaces as
+        a validation error instead of an IntegrityError.
+        """
+        try:
+            with transaction.atomic():
+                return save(*args)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"external_id": [EXTERNAL_ID_EXISTS_MESSAGE]}
+            )
@@ -1,6 +1,6 @@
 from faker import Faker
 import random
-from typing import List, Optional
+from typing import Any, List, Optional
 
 fake = Faker()
 
@@ -33,6 +33,7 @@ class PlanetDataGenerator:
         "crisp",
         "muggy",
     ]
+    CLIMATE_TYPES_SET = frozenset(CLIMATE_TYPES)
 
     TERRAIN_TYPES = [
         "desert",
@@ -62,6 +63,15 @@ class PlanetDataGenerator:
         "glaciers",
         "cliffs",
     ]
+    TERRAIN_TYPES_SET = frozenset(TERRAIN_TYPES)
+
+    POPULATION_RANGES = [
+        (1000, 10000),
+        (10000, 100000),
+        (100000, 1000000),
+        (1000000, 10000000),
+        (10000000, 100000000),
+    ]
 
     @classmethod
     def generate_population(cls) -> int:
@@ -71,19 +81,22 @@ class PlanetDataGenerator:
         Returns:
             Random population number
         """
-        population_ranges = [
-            (1000, 10000),
-            (10000, 100000),
-            (100000, 1000000),
-            (1000000, 10000000),
-            (10000000, 100000000)
-        ]
+        return cls.generate_populations_batch(1)[0]
+
+    @classmethod
+    def generate_populations_batch(cls, count: int) -> List[int]:
+        """
+        Generate random populations for several planets at once.
 
-        min_pop, max_pop = random.choice(population_ranges)
+        Args:
+            count: Number of populations to generate
 
-        population = random.randint(min_pop, max_pop)
+        Returns:
+            List of population numbers rounded down to the thousand
+        """
+        ranges = random.choices(cls.POPULATION_RANGES, k=count)
 
-        return (population // 1000) * 1000
+        return [(random.randint(min_pop, max_pop) // 1000) * 1000 for min_pop, max_pop in ranges]
 
     @classmethod
     def generate_climates(cls, count: Optional[int] = None) -> List[str]:
@@ -96,10 +109,26 @@ class PlanetDataGenerator:
         Returns:
             List of climate types
         """
-        if count is None:
-            count = random.randint(1, 3)
+        return cls.generate_climates_batch(1, None if count is None else [count])[0]
+
+    @classmethod
+    def generate_climates_batch(
+        cls, count: int, sizes: Optional[List[int]] = None
+    ) -> List[List[str]]:
+        """
+        Generate random climate types for several planets at once.
+
+        Args:
+            count: Number of planets to generate climates for
+            sizes: Number of climates per planet (random 1-3 if None)
+
+        Returns:
+            One list of distinct climate types per planet
+        """
+        if sizes is None:
+            sizes = random.choices(range(1, 4), k=count)
 
-        return random.sample(cls.CLIMATE_TYPES, min(count, len(cls.CLIMATE_TYPES)))
+        return cls._sample_batch(cls.CLIMATE_TYPES, sizes)
 
     @classmethod
     def generate_terrains(cls, count: Optional[int] = None) -> List[str]:
@@ -112,10 +141,33 @@ class PlanetDataGenerator:
         Returns:
             List of terrain types
         """
-        if count is None:
-            count = random.randint(2, 4)
+        return cls.generate_terrains_batch(1, None if count is None else [count])[0]
 
-        return random.sample(cls.TERRAIN_TYPES, min(count, len(cls.TERRAIN_TYPES)))
+    @classmethod
+    def generate_terrains_batch(
+        cls, count: int, sizes: Optional[List[int]] = None
+    ) -> List[List[str]]:
+        """
+        Generate random terrain types for several planets at once.
+
+        Args:
+            count: Number of planets to generate terrains for
+            sizes: Number of terrains per planet (random 2-4 if None)
+
+        Returns:
+            One list of distinct terrain types per planet
+        """
+        if sizes is None:
+            sizes = random.choices(range(2, 5), k=count)
+
+        return cls._sample_batch(cls.TERRAIN_TYPES, sizes)
+
+    @staticmethod
+    def _sample_batch(choices: List[str], sizes: List[int]) -> List[List[str]]:
+        """Draw one sample without replacement per requested size."""
+        sample = random.sample
+        limit = len(choices)
+        return [sample(choices, min(size, limit)) for size in sizes]
 
     @classmethod
     def generate_planet_data(cls, planet_name: str, original_data: dict) -> dict:
@@ -129,15 +181,43 @@ class PlanetDataGenerator:
         Returns:
             Complete planet data with generated values for null fields
         """
-        generated_data = original_data.copy()
-
-        if not original_data.get("population"):
-            generated_data["population"] = cls.generate_population()
+        return cls.fill_missing_fields([original_data.copy()])[0]
 
-        if not original_data.get("climates"):
-            generated_data["climates"] = cls.generate_climates()
+    @classmethod
+    def fill_missing_fields(cls, records: List[Any]) -> List[Any]:
+        """
+        Fill null values of a batch of planet records in place.
+        Each field is handled as one column so values are generated together.
 
-        if not original_data.get("terrains"):
-            generated_data["terrains"] = cls.generate_terrains()
+        Args:
+            records: Planet dicts, or objects with population, climates and
+                terrains attributes
 
-        return generated_data
+        Returns:
+            The same records with generated values for null fields
+        """
+        for field, generate_batch in (
+            ("population", cls.generate_populations_batch),
+            ("climates", cls.generate_climates_batch),
+            ("terrains", cls.generate_terrains_batch),
+        ):
+            missing = [r for r in records if not cls._get_field(r, field)]
+            for record, value in zip(missing, generate_batch(len(missing))):
+                cls._set_field(record, field, value)
+
+        return records
+
+    @staticmethod
+    def _get_field(record: Any, field: str) -> Any:
+        """Read a field from a dict or an attribute-style record."""
+        if isinstance(record, dict):
+            return record.get(field)
+        return getattr(record, field)
+
+    @staticmethod
+    def _set_field(record: Any, field: str, value: Any) -> None:
+        """Write a field on a dict or an attribute-style record."""
+        if isinstance(record, dict):
+            record[field] = value
+        else:
+            setattr(record, field, value)
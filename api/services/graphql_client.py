@@ -1,5 +1,7 @@
+import orjson
 import requests
 import logging
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
@@ -11,13 +13,28 @@ class GraphQLClient:
     Handles authentication, requests, and error handling.
     """
 
-    def __init__(self, endpoint_url: str, headers: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        endpoint_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_connections: int = 10,
+    ):
         self.endpoint_url = endpoint_url
         self.headers = headers or {}
+        self.max_connections = max_connections
+        self._post_headers = {"Content-Type": "application/json", **self.headers}
         self.session = requests.Session()
 
+        # Keep up to max_connections pooled keep-alive connections per host
+        adapter = HTTPAdapter(pool_maxsize=max_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
     def query(
-        self, query: str, variables: Optional[Dict[str, Any]] = None
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        body_bytes: Optional[bytes] = None,
     ) -> Dict[str, Any]:
         """
         Execute a GraphQL query.
@@ -25,6 +42,7 @@ class GraphQLClient:
         Args:
             query: GraphQL query string
             variables: Query variables
+            body_bytes: Pre-serialized JSON request body, used instead of query/variables
 
         Returns:
             Response data as dictionary
@@ -33,15 +51,16 @@ class GraphQLClient:
             requests.RequestException: If the request fails
             ValueError: If the response contains errors
         """
-        payload = {"query": query, "variables": variables or {}}
+        if body_bytes is None:
+            body_bytes = orjson.dumps({"query": query, "variables": variables or {}})
 
         try:
             response = self.session.post(
-                self.endpoint_url, json=payload, headers=self.headers, timeout=30
+                self.endpoint_url, data=body_bytes, headers=self._post_headers, timeout=30
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
 
             if "errors" in data:
                 error_messages = [
@@ -52,13 +71,13 @@ class GraphQLClient:
             return data.get("data", {})
 
         except requests.RequestException as e:
-            logger.error(f"GraphQL request failed: {e}")
+            logger.error("GraphQL request failed: %s", e)
             raise
         except ValueError as e:
-            logger.error(f"GraphQL response error: {e}")
+            logger.error("GraphQL response error: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error in GraphQL query: {e}")
+            logger.error("Unexpected error in GraphQL query: %s", e)
             raise
 
 
@@ -76,6 +95,9 @@ class StarWarsGraphQLClient(GraphQLClient):
                 "Content-Type": "application/json",
             },
         )
+        # The planets query never changes, so build its text and request body once
+        self._planets_query = self.get_planets_query()
+        self._planets_body = orjson.dumps({"query": self._planets_query, "variables": {}})
 
     def get_planets_query(self) -> str:
         """
@@ -94,11 +116,33 @@ class StarWarsGraphQLClient(GraphQLClient):
                     population
                     climates
                     terrains
+                    edited
                 }
             }
         }
         """
 
+    def get_planet_query(self) -> str:
+        """
+        Get the GraphQL query for fetching a single planet by ID.
+
+        Returns:
+            GraphQL query string taking an $id variable
+        """
+
+        return """
+        query GetPlanet($id: ID!) {
+            planet(id: $id) {
+                id
+                name
+                population
+                climates
+                terrains
+                edited
+            }
+        }
+        """
+
     def fetch_planets(self) -> Dict[str, Any]:
         """
         Fetch planets from the Star Wars API.
@@ -106,5 +150,16 @@ class StarWarsGraphQLClient(GraphQLClient):
         Returns:
             Dictionary containing planets data and pagination info
         """
-        query = self.get_planets_query()
-        return self.query(query)
+        return self.query(self._planets_query, body_bytes=self._planets_body)
+
+    def fetch_planet(self, planet_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a single planet from the Star Wars API.
+
+        Args:
+            planet_id: GraphQL ID of the planet
+
+        Returns:
+            Planet data, or None if no planet has this ID
+        """
+        return self.query(self.get_planet_query(), {"id": planet_id}).get("planet")
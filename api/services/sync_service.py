@@ -1,25 +1,91 @@
+import csv
+import hashlib
+import io
 import logging
-from typing import Dict, Any
-from django.db import transaction
+import orjson
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max
 from django.utils import timezone
 from .graphql_client import StarWarsGraphQLClient
 from .data_generator import PlanetDataGenerator
-from ..models import Planet
+from ..models import Planet, SyncCursor
+from ..pagination import invalidate_planet_count
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class PlanetRow:
+    """A transformed planet ready to be written to the database."""
+
+    external_id: Optional[str]
+    name: str
+    population: Optional[int]
+    climates: Optional[List[str]]
+    terrains: Optional[List[str]]
+    content_hash: str = ""
+
+    def to_model(self, **extra) -> Planet:
+        """Build an unsaved Planet instance from this row."""
+        return Planet(
+            external_id=self.external_id,
+            name=self.name,
+            population=self.population,
+            climates=self.climates,
+            terrains=self.terrains,
+            content_hash=self.content_hash,
+            **extra,
+        )
+
+
 class PlanetSyncService:
     """
     Service for synchronizing planet data from GraphQL API to local database.
     Handles data fetching, transformation, and database updates.
     """
 
-    def __init__(self):
-        self.client = StarWarsGraphQLClient()
-        self.stats = {"created": 0, "updated": 0, "errors": 0, "total_processed": 0}
+    # Columns rewritten when an incoming planet conflicts on external_id
+    UPSERT_FIELDS = ["name", "population", "climates", "terrains", "content_hash", "updated_at"]
+
+    # Stats of the last completed sync in this process, shared by every instance
+    _last_sync_stats: Dict[str, int] = {}
+    _last_sync_lock = threading.Lock()
+
+    def __init__(self, client: Optional[StarWarsGraphQLClient] = None):
+        """
+        Args:
+            client: GraphQL client to fetch planets with (a new one if None)
+        """
+        self.client = client or StarWarsGraphQLClient()
+        self._reset_stats()
+
+    @classmethod
+    def last_sync_stats(cls) -> Dict[str, int]:
+        """Return a copy of the stats recorded by the last completed sync."""
+        with cls._last_sync_lock:
+            return dict(cls._last_sync_stats)
 
-    def _transform_planet_data(self, planet_data: Dict[str, Any]) -> Dict[str, Any]:
+    @classmethod
+    def _record_last_sync_stats(cls, stats: Dict[str, int]):
+        """Publish the stats of a completed sync for get_sync_status."""
+        with cls._last_sync_lock:
+            PlanetSyncService._last_sync_stats = dict(stats)
+
+    def _reset_stats(self):
+        """Zero the statistics collected by the previous sync."""
+        self.stats = {
+            "created": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "errors": 0,
+            "total_processed": 0,
+        }
+
+    def _transform_planet_data(self, planet_data: Dict[str, Any]) -> PlanetRow:
         """
         Transform GraphQL planet data to match our model structure.
         Generate fake data for null/missing values using PlanetDataGenerator.
@@ -28,72 +94,278 @@ class PlanetSyncService:
             planet_data: Raw planet data from GraphQL
 
         Returns:
-            Transformed data ready for database with generated values for null fields
+            Transformed row ready for database with generated values for null fields
         """
-        planet_name = planet_data.get("name", "Unknown Planet")
+        return self._transform_planets([planet_data])[0]
+
+    def _transform_planets(self, planets: List[Dict[str, Any]]) -> List[PlanetRow]:
+        """
+        Transform a batch of GraphQL planets to match our model structure.
+        Null values are generated per column by PlanetDataGenerator.
+
+        Args:
+            planets: Raw planet data from GraphQL
+
+        Returns:
+            Transformed rows ready for database, skipping malformed planets
+        """
+        rows = []
+        for planet_data in planets:
+            try:
+                rows.append(
+                    PlanetRow(
+                        planet_data.get("id"),
+                        planet_data.get("name", ""),
+                        planet_data.get("population"),
+                        planet_data.get("climates"),
+                        planet_data.get("terrains"),
+                        self._content_hash(planet_data),
+                    )
+                )
+            except Exception as e:
+                logger.error("Failed to process planet: %s", e)
+                self.stats["errors"] += 1
+
+        return PlanetDataGenerator.fill_missing_fields(rows)
 
-        complete_data = PlanetDataGenerator.generate_planet_data(
-            planet_name, planet_data
+    @staticmethod
+    def _content_hash(planet_data: Dict[str, Any]) -> str:
+        """
+        Hash the upstream fields of a planet before missing values are generated,
+        so an unchanged source payload always yields the same digest.
+        """
+        payload = orjson.dumps(
+            [
+                planet_data.get("name", ""),
+                planet_data.get("population"),
+                planet_data.get("climates"),
+                planet_data.get("terrains"),
+            ]
         )
+        return hashlib.blake2b(payload, digest_size=8).hexdigest()
 
-        return {
-            "external_id": complete_data.get("id"),
-            "name": complete_data.get("name", ""),
-            "population": complete_data.get("population", 0),
-            "climates": complete_data.get("climates", []),
-            "terrains": complete_data.get("terrains", []),
-        }
+    @staticmethod
+    def _edited_at(planet_data: Any) -> str:
+        """Return the planet's ISO-8601 edited timestamp, or "" if unknown."""
+        if isinstance(planet_data, dict):
+            return planet_data.get("edited") or ""
+        return ""
 
-    def _update_or_create_planet(
-        self, planet_data: Dict[str, Any]
-    ) -> tuple[Planet, bool]:
+    @staticmethod
+    def _load_stored_hashes(external_ids: List[Optional[str]]) -> Dict[str, str]:
         """
-        Update existing planet or create new one.
+        Look up the stored content_hash of the given planets in one query.
 
         Args:
-            planet_data: Transformed planet data
+            external_ids: External IDs to look up
 
         Returns:
-            Tuple of (planet_instance, created_boolean)
+            Mapping of external_id to content_hash for the planets already stored
         """
-        external_id = planet_data["external_id"]
+        return dict(
+            Planet.objects.filter(external_id__in=external_ids).values_list(
+                "external_id", "content_hash"
+            )
+        )
+
+    def _upsert_planets(
+        self,
+        planet_rows: List[PlanetRow],
+        stored_hashes: Optional[Dict[str, str]] = None,
+    ) -> tuple[List[Planet], set]:
+        """
+        Insert or update planets in bulk, keyed by external_id.
+        Issues one existence query, unless stored_hashes is given, plus one
+        upsert statement. Rows whose stored content_hash matches the incoming
+        one are not written.
+
+        Args:
+            planet_rows: Transformed planet rows
+            stored_hashes: Preloaded external_id -> content_hash mapping covering
+                these rows; updated in place with the rows written
+
+        Returns:
+            Tuple of (written_planet_instances, existing_external_ids)
+        """
+        # Last occurrence wins so a batch never touches the same row twice
+        rows = {row.external_id: row for row in planet_rows}
 
         try:
-            planet, created = Planet.objects.update_or_create(
-                external_id=external_id,
-                defaults={
-                    "name": planet_data["name"],
-                    "population": planet_data["population"],
-                    "climates": planet_data["climates"],
-                    "terrains": planet_data["terrains"],
-                    "updated_at": timezone.now(),
-                },
-            )
+            if stored_hashes is None:
+                stored_hashes = self._load_stored_hashes(list(rows))
+            existing = rows.keys() & stored_hashes.keys()
 
-            if created:
-                self.stats["created"] += 1
-                logger.info(f"Created planet: {planet.name} (External ID: {external_id})")
+            unchanged = {
+                external_id
+                for external_id, row in rows.items()
+                if row.content_hash and stored_hashes.get(external_id) == row.content_hash
+            }
+            for external_id in unchanged:
+                del rows[external_id]
+
+            if not rows:
+                planets = []
+            elif (
+                connection.vendor == "postgresql"
+                and len(rows) >= settings.PLANET_COPY_THRESHOLD
+            ):
+                planets = self._copy_upsert(list(rows.values()))
             else:
-                self.stats["updated"] += 1
-                logger.info(f"Updated planet: {planet.name} (External ID: {external_id})")
+                planets = Planet.objects.bulk_create(
+                    [row.to_model() for row in rows.values()],
+                    update_conflicts=True,
+                    unique_fields=["external_id"],
+                    update_fields=self.UPSERT_FIELDS,
+                    batch_size=settings.PLANET_BULK_BATCH,
+                )
+
+            self.stats["created"] += len(rows.keys() - existing)
+            self.stats["updated"] += len(rows.keys() & existing)
+            self.stats["unchanged"] += len(unchanged)
+            stored_hashes.update((external_id, row.content_hash) for external_id, row in rows.items())
 
-            return planet, created
+            return planets, existing
 
         except Exception as e:
-            self.stats["errors"] += 1
-            logger.error(f"Error processing planet {external_id}: {e}")
+            self.stats["errors"] += len(rows)
+            logger.error("Error upserting %d planets: %s", len(rows), e)
             raise
 
-    def sync_planets(self) -> Dict[str, int]:
+    def _copy_upsert(self, planet_rows: List[PlanetRow]) -> List[Planet]:
+        """
+        Upsert planets on PostgreSQL by streaming them into a staging table
+        with COPY, then merging with a single INSERT ... ON CONFLICT.
+
+        Args:
+            planet_rows: Transformed planet rows with unique external_ids
+
+        Returns:
+            Planet instances with primary keys set
+        """
+        table = Planet._meta.db_table
+        now = timezone.now()
+
+        # COPY skips Django's field preparation, so a float population such as 2e9
+        # from the generator would reach the integer column as "2000000000.0"
+        population_field = Planet._meta.get_field("population")
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in planet_rows:
+            writer.writerow(
+                [
+                    row.external_id,
+                    row.name,
+                    population_field.get_prep_value(row.population),
+                    orjson.dumps(row.climates).decode(),
+                    orjson.dumps(row.terrains).decode(),
+                    row.content_hash,
+                ]
+            )
+        buffer.seek(0)
+
+        # The staging table lives until the enclosing transaction commits
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {table}_stage ("
+                "external_id varchar(255), name varchar(255), population integer, "
+                "climates jsonb, terrains jsonb, content_hash varchar(16)) ON COMMIT DROP"
+            )
+            cursor.execute(f"TRUNCATE {table}_stage")
+            cursor.copy_expert(
+                f"COPY {table}_stage (external_id, name, population, climates, terrains, content_hash) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+            cursor.execute(
+                f"INSERT INTO {table} "
+                "(external_id, name, population, climates, terrains, content_hash, created_at, updated_at) "
+                "SELECT external_id, name, population, climates, terrains, content_hash, %s, %s "
+                f"FROM {table}_stage "
+                "ON CONFLICT (external_id) DO UPDATE SET "
+                "name = EXCLUDED.name, population = EXCLUDED.population, "
+                "climates = EXCLUDED.climates, terrains = EXCLUDED.terrains, "
+                "content_hash = EXCLUDED.content_hash, updated_at = EXCLUDED.updated_at "
+                "RETURNING id, external_id",
+                [now, now],
+            )
+            ids = {external_id: pk for pk, external_id in cursor.fetchall()}
+
+        return [
+            row.to_model(id=ids.get(row.external_id), updated_at=now)
+            for row in planet_rows
+        ]
+
+    def _update_or_create_planet(self, planet_row: PlanetRow) -> tuple[Planet, bool]:
         """
-        Synchronize all planets from GraphQL API to local database.
+        Update existing planet or create new one.
+
+        Args:
+            planet_row: Transformed planet row
+
+        Returns:
+            Tuple of (planet_instance, created_boolean)
+        """
+        external_id = planet_row.external_id
+
+        planets, existing = self._upsert_planets([planet_row])
+        created = external_id not in existing
+        planet = planets[0] if planets else Planet.objects.get(external_id=external_id)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "%s planet: %s (External ID: %s)",
+                "Created" if created else "Updated",
+                planet.name,
+                external_id,
+            )
+
+        return planet, created
+
+    def sync_single_planet(self, planet_id: str) -> Optional[Planet]:
+        """
+        Synchronize one planet from GraphQL API to local database.
+        The planet is written with a single INSERT ... ON CONFLICT statement.
+
+        Args:
+            planet_id: GraphQL ID of the planet
+
+        Returns:
+            The stored planet, or None if the API has no planet with this ID
+        """
+        planet_data = self.client.fetch_planet(planet_id)
+        if not planet_data:
+            logger.warning("Planet %s not found in API", planet_id)
+            return None
+
+        planet_row = self._transform_planet_data(planet_data)
+        planet = Planet.objects.bulk_create(
+            [planet_row.to_model()],
+            update_conflicts=True,
+            unique_fields=["external_id"],
+            update_fields=self.UPSERT_FIELDS,
+        )[0]
+        # Bulk upserts bypass the post_save signal that keeps the count fresh
+        invalidate_planet_count()
+
+        logger.info("Synced planet: %s (External ID: %s)", planet.name, planet_id)
+        return planet
+
+    def sync_planets(self, full: bool = False) -> Dict[str, int]:
+        """
+        Synchronize planets from GraphQL API to local database.
+        Planets not edited since the last sync are skipped unless full is set,
+        except those edited or deleted locally, which are restored from upstream.
+
+        Args:
+            full: Re-sync every planet, ignoring the sync cursor
 
         Returns:
             Dictionary with sync statistics
         """
         logger.info("Starting planet synchronization...")
 
-        self.stats = {"created": 0, "updated": 0, "errors": 0, "total_processed": 0}
+        self._reset_stats()
 
         try:
             response_data = self.client.fetch_planets()
@@ -104,24 +376,56 @@ class PlanetSyncService:
                 logger.warning("No planets returned from API")
 
             with transaction.atomic():
-                for planet_data in planets:
-                    try:
-                        transformed_data = self._transform_planet_data(planet_data)
-                        self._update_or_create_planet(transformed_data)
-                        self.stats["total_processed"] += 1
+                sync_cursor, _ = SyncCursor.objects.get_or_create(name="planets")
+                latest_edit = max(map(self._edited_at, planets), default="")
+
+                # One lookup for the whole sync instead of one per batch
+                stored_hashes = self._load_stored_hashes(
+                    [p["id"] for p in planets if isinstance(p, dict) and p.get("id")]
+                )
+
+                # The API has no "since" filter, so unchanged planets are dropped here.
+                # Planets deleted locally (no stored hash) or edited locally (blank
+                # hash) are kept so they are restored.
+                if not full and sync_cursor.cursor:
+                    planets = [
+                        p
+                        for p in planets
+                        if self._edited_at(p) > sync_cursor.cursor
+                        or (isinstance(p, dict) and not stored_hashes.get(p.get("id")))
+                    ]
 
-                    except Exception as e:
-                        logger.error(f"Failed to process planet: {e}")
-                        self.stats["errors"] += 1
-                        continue
+                batch_size = settings.PLANET_BULK_BATCH
+                for start in range(0, len(planets), batch_size):
+                    transformed = self._transform_planets(
+                        planets[start:start + batch_size]
+                    )
+                    if transformed:
+                        self._upsert_planets(transformed, stored_hashes)
+                        self.stats["total_processed"] += len(transformed)
 
-            logger.info(f"Processed batch: {len(planets)} planets")
+                # Only advance past planets that were all stored successfully
+                if not self.stats["errors"] and latest_edit > sync_cursor.cursor:
+                    sync_cursor.cursor = latest_edit
+                    sync_cursor.save(update_fields=["cursor", "updated_at"])
 
-            logger.info(f"Planet synchronization completed. Stats: {self.stats}")
+            # Bulk upserts bypass the post_save signal that keeps the count fresh
+            if self.stats["created"]:
+                invalidate_planet_count()
+
+            logger.info(
+                "Sync complete: created=%d updated=%d unchanged=%d errors=%d total_processed=%d",
+                self.stats["created"],
+                self.stats["updated"],
+                self.stats["unchanged"],
+                self.stats["errors"],
+                self.stats["total_processed"],
+            )
+            self._record_last_sync_stats(self.stats)
             return self.stats
 
         except Exception as e:
-            logger.error(f"Planet synchronization failed: {e}")
+            logger.error("Planet synchronization failed: %s", e)
             raise
 
     def get_sync_status(self) -> Dict[str, Any]:
@@ -131,12 +435,21 @@ class PlanetSyncService:
         Returns:
             Dictionary with sync status information
         """
-        total_planets = Planet.objects.count()
-        last_sync = Planet.objects.order_by("-updated_at").first()
+        summary = Planet.objects.aggregate(
+            total=Count("id"), last_sync_time=Max("updated_at")
+        )
+
+        last_updated_planet = None
+        if summary["last_sync_time"]:
+            last_updated_planet = (
+                Planet.objects.filter(updated_at=summary["last_sync_time"])
+                .values_list("name", flat=True)
+                .first()
+            )
 
         return {
-            "total_planets_in_db": total_planets,
-            "last_updated_planet": last_sync.name if last_sync else None,
-            "last_sync_time": last_sync.updated_at if last_sync else None,
-            "last_sync_stats": self.stats,
+            "total_planets_in_db": summary["total"],
+            "last_updated_planet": last_updated_planet,
+            "last_sync_time": summary["last_sync_time"],
+            "last_sync_stats": self.last_sync_stats(),
         }
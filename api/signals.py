@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Planet
+from .pagination import invalidate_planet_count
+
+
+@receiver(post_save, sender=Planet)
+@receiver(post_delete, sender=Planet)
+def planet_count_changed(sender, created=True, **kwargs):
+    """Invalidate the cached planet count when a planet is created or deleted."""
+    if created:
+        invalidate_planet_count()
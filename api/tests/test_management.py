@@ -2,208 +2,226 @@ from django.test import TestCase
 from django.core.management import call_command
 from django.core.management.base import CommandError
 from io import StringIO
-from unittest.mock import patch, Mock
-import subprocess
-import sys
+from types import MappingProxyType
+from unittest.mock import patch
+from api.management.commands.sync_planets import Command
+
+
+def _stats(created=0, updated=0, unchanged=0, errors=0, total_processed=0):
+    """Build a read-only sync stats mapping as returned by PlanetSyncService."""
+    return MappingProxyType(
+        {
+            "created": created,
+            "updated": updated,
+            "unchanged": unchanged,
+            "errors": errors,
+            "total_processed": total_processed,
+        }
+    )
+
+
+def assert_all_in(tc, substrings, haystack):
+    """Fail `tc` once, listing every substring missing from `haystack`."""
+    missing = [s for s in substrings if s not in haystack]
+    tc.assertFalse(missing, f"missing from output: {missing}")
+
+
+_STATS_SUCCESS = _stats(created=5, updated=2, total_processed=7)
+_STATS_WITH_ERRORS = _stats(created=3, updated=1, errors=2, total_processed=6)
+_STATS_FULL = _stats(updated=7, total_processed=7)
+_STATS_VERBOSE = _stats(created=3, updated=1, total_processed=4)
+_STATS_EMPTY = _stats()
+
+_STATUS_OK = MappingProxyType(
+    {
+        "total_planets_in_db": 10,
+        "last_updated_planet": "Tatooine",
+        "last_sync_time": "2023-01-01T00:00:00Z",
+        "last_sync_stats": _STATS_SUCCESS,
+    }
+)
+_STATUS_EMPTY = MappingProxyType(
+    {
+        "total_planets_in_db": 0,
+        "last_updated_planet": None,
+        "last_sync_time": None,
+        "last_sync_stats": MappingProxyType({}),
+    }
+)
+_STATUS_ALDERAAN = MappingProxyType(
+    {
+        "total_planets_in_db": 5,
+        "last_updated_planet": "Alderaan",
+        "last_sync_time": "2023-01-01T00:00:00Z",
+        "last_sync_stats": MappingProxyType({}),
+    }
+)
 
 
 class SyncPlanetsCommandTest(TestCase):
     """Test cases for the sync_planets management command."""
 
+    # Shared output sink, emptied before each test
+    out = StringIO()
+
     def setUp(self):
         """Set up test data."""
-        self.out = StringIO()
-
-    @patch("api.management.commands.sync_planets.PlanetSyncService")
-    def test_sync_planets_success(self, mock_sync_service):
-        """Test successful planet synchronization."""
-        mock_service_instance = Mock()
-        mock_sync_service.return_value = mock_service_instance
-        mock_service_instance.sync_planets.return_value = {
-            "created": 5,
-            "updated": 2,
-            "errors": 0,
-            "total_processed": 7,
-        }
-
-        call_command("sync_planets", stdout=self.out)
-
-        output = self.out.getvalue()
-        self.assertIn("Starting planet synchronization...", output)
-        self.assertIn("=== Sync Completed ===", output)
-        self.assertIn("Created: 5", output)
-        self.assertIn("Updated: 2", output)
-        self.assertIn("Errors: 0", output)
-        self.assertIn("Total processed: 7", output)
-        self.assertIn("Sync completed successfully!", output)
-
-        mock_service_instance.sync_planets.assert_called_once()
-
-    @patch("api.management.commands.sync_planets.PlanetSyncService")
-    def test_sync_planets_with_errors(self, mock_sync_service):
-        """Test planet synchronization with errors."""
-        mock_service_instance = Mock()
-        mock_sync_service.return_value = mock_service_instance
-        mock_service_instance.sync_planets.return_value = {
-            "created": 3,
-            "updated": 1,
-            "errors": 2,
-            "total_processed": 6,
-        }
-
-        call_command("sync_planets", stdout=self.out)
-
-        output = self.out.getvalue()
-        self.assertIn("Sync completed with 2 errors", output)
-        self.assertIn("Errors: 2", output)
-
-    @patch("api.management.commands.sync_planets.PlanetSyncService")
-    def test_sync_planets_exception(self, mock_sync_service):
+        self.out.seek(0)
+        self.out.truncate(0)
+
+        # spec=True restricts the mock and its instances to PlanetSyncService's API
+        patcher = patch("api.management.commands.sync_planets.PlanetSyncService", spec=True)
+        self.mock_sync_service = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_service_instance = self.mock_sync_service.return_value
+
+    def run_command(self, **options):
+        """Run the command's handle() directly, skipping command discovery and argparse."""
+        options = {"status": False, "verbose": False, "full": False, **options}
+        Command(stdout=self.out, stderr=StringIO()).handle(**options)
+
+    def test_sync_planets_output(self):
+        """Test the sync summary for successful, failing, empty and verbose runs."""
+        cases = [
+            (
+                _STATS_SUCCESS,
+                [],
+                [
+                    "Starting planet synchronization...",
+                    "=== Sync Completed ===",
+                    "Created: 5",
+                    "Updated: 2",
+                    "Errors: 0",
+                    "Total processed: 7",
+                    "Sync completed successfully!",
+                ],
+            ),
+            (_STATS_WITH_ERRORS, [], ["Sync completed with 2 errors", "Errors: 2"]),
+            (
+                _STATS_EMPTY,
+                [],
+                [
+                    "Created: 0",
+                    "Updated: 0",
+                    "Errors: 0",
+                    "Total processed: 0",
+                    "Sync completed successfully!",
+                ],
+            ),
+            (
+                _STATS_VERBOSE,
+                ["--verbose"],
+                ["Starting planet synchronization...", "Sync completed successfully!"],
+            ),
+        ]
+
+        for stats, args, expected in cases:
+            with self.subTest(stats=dict(stats), args=args):
+                self.out.seek(0)
+                self.out.truncate(0)
+                self.mock_service_instance.reset_mock()
+                self.mock_service_instance.sync_planets.return_value = stats
+
+                call_command("sync_planets", *args, stdout=self.out)
+
+                output = self.out.getvalue()
+                assert_all_in(self, expected, output)
+                self.mock_service_instance.sync_planets.assert_called_once_with(full=False)
+
+    def test_sync_planets_full(self):
+        """Test that --full bypasses the incremental sync cursor."""
+        self.mock_service_instance.sync_planets.return_value = _STATS_FULL
+
+        call_command("sync_planets", "--full", stdout=self.out)
+
+        self.assertIn("Updated: 7", self.out.getvalue())
+        self.mock_service_instance.sync_planets.assert_called_once_with(full=True)
+
+    def test_sync_planets_exception(self):
         """Test planet synchronization when an exception occurs."""
-        mock_service_instance = Mock()
-        mock_sync_service.return_value = mock_service_instance
-        mock_service_instance.sync_planets.side_effect = Exception("API Error")
+        self.mock_service_instance.sync_planets.side_effect = Exception("API Error")
 
         with self.assertRaises(CommandError) as context:
-            call_command("sync_planets", stdout=self.out)
+            self.run_command()
 
         self.assertIn("API Error", str(context.exception))
 
-    @patch("api.management.commands.sync_planets.PlanetSyncService")
-    def test_sync_status_command(self, mock_sync_service):
+    def test_sync_status_command(self):
         """Test sync status command."""
-        mock_service_instance = Mock()
-        mock_sync_service.return_value = mock_service_instance
-        mock_service_instance.get_sync_status.return_value = {
-            "total_planets_in_db": 10,
-            "last_updated_planet": "Tatooine",
-            "last_sync_time": "2023-01-01T00:00:00Z",
-            "last_sync_stats": {
-                "created": 5,
-                "updated": 2,
-                "errors": 0,
-                "total_processed": 7,
-            },
-        }
+        self.mock_service_instance.get_sync_status.return_value = _STATUS_OK
 
-        call_command("sync_planets", "--status", stdout=self.out)
+        self.run_command(status=True)
 
         output = self.out.getvalue()
-        self.assertIn("=== Planet Sync Status ===", output)
-        self.assertIn("Total planets in database: 10", output)
-        self.assertIn("Last updated planet: Tatooine", output)
-        self.assertIn("Last sync time: 2023-01-01T00:00:00Z", output)
+        assert_all_in(
+            self,
+            [
+                "=== Planet Sync Status ===",
+                "Total planets in database: 10",
+                "Last updated planet: Tatooine",
+                "Last sync time: 2023-01-01T00:00:00Z",
+            ],
+            output,
+        )
 
         # Should not call sync_planets when --status is used
-        mock_service_instance.sync_planets.assert_not_called()
-        mock_service_instance.get_sync_status.assert_called_once()
+        self.mock_service_instance.sync_planets.assert_not_called()
+        self.mock_service_instance.get_sync_status.assert_called_once()
 
-    @patch("api.management.commands.sync_planets.PlanetSyncService")
-    def test_sync_status_empty_db(self, mock_sync_service):
+    def test_sync_status_empty_db(self):
         """Test sync status with empty database."""
-        mock_service_instance = Mock()
-        mock_sync_service.return_value = mock_service_instance
-        mock_service_instance.get_sync_status.return_value = {
-            "total_planets_in_db": 0,
-            "last_updated_planet": None,
-            "last_sync_time": None,
-            "last_sync_stats": {},
-        }
+        self.mock_service_instance.get_sync_status.return_value = _STATUS_EMPTY
 
-        call_command("sync_planets", "--status", stdout=self.out)
+        self.run_command(status=True)
 
         output = self.out.getvalue()
-        self.assertIn("Total planets in database: 0", output)
-        self.assertIn("Last updated planet: None", output)
-        self.assertIn("Last sync time: Never", output)
-
-    @patch("api.management.commands.sync_planets.PlanetSyncService")
-    def test_sync_planets_verbose(self, mock_sync_service):
-        """Test planet synchronization with verbose output."""
-        mock_service_instance = Mock()
-        mock_sync_service.return_value = mock_service_instance
-        mock_service_instance.sync_planets.return_value = {
-            "created": 3,
-            "updated": 1,
-            "errors": 0,
-            "total_processed": 4,
-        }
-
-        call_command("sync_planets", "--verbose", stdout=self.out)
-
-        output = self.out.getvalue()
-        self.assertIn("Starting planet synchronization...", output)
-        self.assertIn("Sync completed successfully!", output)
-
-        mock_service_instance.sync_planets.assert_called_once()
+        assert_all_in(
+            self,
+            [
+                "Total planets in database: 0",
+                "Last updated planet: None",
+                "Last sync time: Never",
+            ],
+            output,
+        )
 
-    @patch("api.management.commands.sync_planets.PlanetSyncService")
-    def test_sync_planets_status_verbose(self, mock_sync_service):
+    def test_sync_planets_status_verbose(self):
         """Test sync status with verbose output."""
-        mock_service_instance = Mock()
-        mock_sync_service.return_value = mock_service_instance
-        mock_service_instance.get_sync_status.return_value = {
-            "total_planets_in_db": 5,
-            "last_updated_planet": "Alderaan",
-            "last_sync_time": "2023-01-01T00:00:00Z",
-            "last_sync_stats": {},
-        }
+        self.mock_service_instance.get_sync_status.return_value = _STATUS_ALDERAAN
 
-        call_command("sync_planets", "--status", "--verbose", stdout=self.out)
+        self.run_command(status=True, verbose=True)
 
         output = self.out.getvalue()
-        self.assertIn("=== Planet Sync Status ===", output)
-        self.assertIn("Total planets in database: 5", output)
-        self.assertIn("Last updated planet: Alderaan", output)
+        assert_all_in(
+            self,
+            [
+                "=== Planet Sync Status ===",
+                "Total planets in database: 5",
+                "Last updated planet: Alderaan",
+            ],
+            output,
+        )
 
         # Should not call sync_planets when --status is used
-        mock_service_instance.sync_planets.assert_not_called()
-        mock_service_instance.get_sync_status.assert_called_once()
+        self.mock_service_instance.sync_planets.assert_not_called()
+        self.mock_service_instance.get_sync_status.assert_called_once()
 
     def test_command_help(self):
         """Test command help text."""
-        # Use subprocess to capture help output
-        result = subprocess.run(
-            [sys.executable, "manage.py", "sync_planets", "--help"],
-            capture_output=True,
-            text=True,
-            cwd="/Users/rafael/Downloads/pit-solutions-django-challenge",
-        )
-
-        output = result.stdout + result.stderr
-        self.assertIn("Synchronize planets from GraphQL API to local database", output)
-        self.assertIn("--status", output)
-        self.assertIn("--verbose", output)
-
-    @patch("api.management.commands.sync_planets.PlanetSyncService")
-    def test_sync_planets_no_planets_synced(self, mock_sync_service):
-        """Test synchronization when no planets are synced."""
-        mock_service_instance = Mock()
-        mock_sync_service.return_value = mock_service_instance
-        mock_service_instance.sync_planets.return_value = {
-            "created": 0,
-            "updated": 0,
-            "errors": 0,
-            "total_processed": 0,
-        }
+        parser = Command().create_parser("manage.py", "sync_planets")
 
-        call_command("sync_planets", stdout=self.out)
+        output = parser.format_help()
+        assert_all_in(
+            self,
+            ["Synchronize planets from GraphQL API to local database", "--status", "--verbose"],
+            output,
+        )
 
-        output = self.out.getvalue()
-        self.assertIn("Created: 0", output)
-        self.assertIn("Updated: 0", output)
-        self.assertIn("Errors: 0", output)
-        self.assertIn("Total processed: 0", output)
-        self.assertIn("Sync completed successfully!", output)
-
-    @patch("api.management.commands.sync_planets.PlanetSyncService")
-    def test_sync_status_exception(self, mock_sync_service):
+    def test_sync_status_exception(self):
         """Test sync status when an exception occurs."""
-        mock_service_instance = Mock()
-        mock_sync_service.return_value = mock_service_instance
-        mock_service_instance.get_sync_status.side_effect = Exception("Status Error")
+        self.mock_service_instance.get_sync_status.side_effect = Exception("Status Error")
 
         with self.assertRaises(CommandError) as context:
-            call_command("sync_planets", "--status", stdout=self.out)
+            self.run_command(status=True)
 
         self.assertIn("Status Error", str(context.exception))
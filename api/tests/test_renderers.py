@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from api.renderers import ORJSONRenderer, ORJSONParser
+import orjson
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    """Test cases for ORJSONRenderer."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.renderer = ORJSONRenderer()
+
+    def test_render_planet_data(self):
+        """Test rendering planet data with nested lists."""
+        data = {
+            "id": 1,
+            "name": "Tatooine",
+            "climates": ["arid"],
+            "terrains": ["desert", "canyons"],
+        }
+
+        rendered = self.renderer.render(data)
+
+        self.assertIsInstance(rendered, bytes)
+        self.assertEqual(orjson.loads(rendered), data)
+
+    def test_render_none(self):
+        """Test rendering no data returns an empty body."""
+        self.assertEqual(self.renderer.render(None), b"")
+
+    def test_render_unsupported_types(self):
+        """Test that types orjson lacks fall back to DRF's encoder."""
+        rendered = self.renderer.render(
+            {"amount": Decimal("1.50"), "detail": gettext_lazy("Not found.")}
+        )
+
+        self.assertEqual(orjson.loads(rendered), {"amount": 1.5, "detail": "Not found."})
+
+    def test_render_aware_datetime(self):
+        """Test that UTC datetimes render with a Z suffix like DRF's encoder."""
+        rendered = self.renderer.render(
+            {"updated_at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)}
+        )
+
+        self.assertEqual(rendered, b'{"updated_at":"2024-01-02T03:04:05Z"}')
+
+
+class ORJSONParserTest(SimpleTestCase):
+    """Test cases for ORJSONParser."""
+
+    def test_parse_json(self):
+        """Test parsing a JSON request body."""
+        data = ORJSONParser().parse(BytesIO(b'{"name": "Hoth", "population": 0}'))
+
+        self.assertEqual(data, {"name": "Hoth", "population": 0})
+
+    def test_parse_invalid_json(self):
+        """Test that malformed JSON raises a parse error."""
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"name": '))
@@ -1,4 +1,6 @@
+from types import MappingProxyType
 from django.test import TestCase
+from rest_framework.exceptions import ValidationError
 from api.models import Planet
 from api.serializers import (
     PlanetSerializer,
@@ -6,13 +8,28 @@ from api.serializers import (
     PlanetCreateUpdateSerializer,
 )
 
+_BASE_INPUT = MappingProxyType(
+    {
+        "name": "Test Planet",
+        "population": 1000000,
+        "climates": ("temperate",),
+        "terrains": ("forest",),
+    }
+)
+
+
+def _make_input(**overrides):
+    """Build serializer input from the shared template with the given overrides."""
+    return {**_BASE_INPUT, **overrides}
+
 
 class PlanetSerializerTest(TestCase):
     """Test cases for PlanetSerializer."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.planet = Planet.objects.create(
+        cls.planet = Planet.objects.create(
             external_id="test-123",
             name="Test Planet",
             population=1000000,
@@ -58,9 +75,10 @@ class PlanetSerializerTest(TestCase):
 class PlanetListSerializerTest(TestCase):
     """Test cases for PlanetListSerializer."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.planet = Planet.objects.create(
+        cls.planet = Planet.objects.create(
             external_id="test-123",
             name="Test Planet",
             population=1000000,
@@ -101,9 +119,10 @@ class PlanetListSerializerTest(TestCase):
 class PlanetCreateUpdateSerializerTest(TestCase):
     """Test cases for PlanetCreateUpdateSerializer."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.planet = Planet.objects.create(
+        cls.planet = Planet.objects.create(
             external_id="test-123",
             name="Test Planet",
             population=1000000,
@@ -184,20 +203,30 @@ class PlanetCreateUpdateSerializerTest(TestCase):
         serializer = PlanetCreateUpdateSerializer(self.planet, data=data)
         self.assertTrue(serializer.is_valid())
 
+        # save() updates and returns the shared instance, so no re-fetch is needed
         planet = serializer.save()
+        self.assertIs(planet, self.planet)
         self.assertEqual(planet.name, "Updated Planet")
         self.assertEqual(planet.population, 3000000)
         self.assertEqual(planet.climates, ["frozen", "cold"])
         self.assertEqual(planet.terrains, ["tundra", "glaciers"])
 
+    def test_planet_update_clears_content_hash(self):
+        """Test that a local edit forces the next sync to rewrite the planet."""
+        self.planet.content_hash = "0123456789abcdef"
+        self.planet.save()
+
+        serializer = PlanetCreateUpdateSerializer(
+            self.planet, data={"population": 5}, partial=True
+        )
+        self.assertTrue(serializer.is_valid())
+
+        planet = serializer.save()
+        self.assertEqual(planet.content_hash, "")
+
     def test_validate_population_negative(self):
         """Test validation of negative population."""
-        data = {
-            "name": "Test Planet",
-            "population": -1000,
-            "climates": ["temperate"],
-            "terrains": ["forest"],
-        }
+        data = _make_input(population=-1000)
 
         serializer = PlanetCreateUpdateSerializer(data=data)
         self.assertFalse(serializer.is_valid())
@@ -205,24 +234,14 @@ class PlanetCreateUpdateSerializerTest(TestCase):
 
     def test_validate_population_zero(self):
         """Test validation of zero population."""
-        data = {
-            "name": "Test Planet",
-            "population": 0,
-            "climates": ["temperate"],
-            "terrains": ["forest"],
-        }
+        data = _make_input(population=0)
 
         serializer = PlanetCreateUpdateSerializer(data=data)
         self.assertTrue(serializer.is_valid())
 
     def test_validate_name_empty(self):
         """Test validation of empty name."""
-        data = {
-            "name": "",
-            "population": 1000000,
-            "climates": ["temperate"],
-            "terrains": ["forest"],
-        }
+        data = _make_input(name="")
 
         serializer = PlanetCreateUpdateSerializer(data=data)
         self.assertFalse(serializer.is_valid())
@@ -230,12 +249,7 @@ class PlanetCreateUpdateSerializerTest(TestCase):
 
     def test_validate_name_whitespace(self):
         """Test validation of name with only whitespace."""
-        data = {
-            "name": "   ",
-            "population": 1000000,
-            "climates": ["temperate"],
-            "terrains": ["forest"],
-        }
+        data = _make_input(name="   ")
 
         serializer = PlanetCreateUpdateSerializer(data=data)
         self.assertFalse(serializer.is_valid())
@@ -243,12 +257,7 @@ class PlanetCreateUpdateSerializerTest(TestCase):
 
     def test_validate_name_stripped(self):
         """Test that name is stripped of whitespace."""
-        data = {
-            "name": "  Test Planet  ",
-            "population": 1000000,
-            "climates": ["temperate"],
-            "terrains": ["forest"],
-        }
+        data = _make_input(name="  Test Planet  ")
 
         serializer = PlanetCreateUpdateSerializer(data=data)
         self.assertTrue(serializer.is_valid())
@@ -257,25 +266,44 @@ class PlanetCreateUpdateSerializerTest(TestCase):
     def test_validate_external_id_unique(self):
         """Test validation of unique external_id."""
         # Create another planet with different external_id
+        Planet.objects.bulk_create(
+            [
+                Planet(
+                    external_id="existing-123",
+                    name="Existing Planet",
+                    population=1000000,
+                    climates=["temperate"],
+                    terrains=["forest"],
+                )
+            ]
+        )
+
+        data = _make_input(external_id="existing-123")
+
+        serializer = PlanetCreateUpdateSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("external_id", serializer.errors)
+
+    def test_save_external_id_conflict(self):
+        """Test that a unique constraint violation on save is a validation error."""
+        data = _make_input(external_id="race-123")
+
+        serializer = PlanetCreateUpdateSerializer(data=data)
+        self.assertTrue(serializer.is_valid())
+
+        # Another writer claims the external_id after validation
         Planet.objects.create(
-            external_id="existing-123",
-            name="Existing Planet",
+            external_id="race-123",
+            name="Racing Planet",
             population=1000000,
             climates=["temperate"],
             terrains=["forest"],
         )
 
-        data = {
-            "external_id": "existing-123",
-            "name": "New Planet",
-            "population": 2000000,
-            "climates": ["arid"],
-            "terrains": ["desert"],
-        }
+        with self.assertRaises(ValidationError) as context:
+            serializer.save()
 
-        serializer = PlanetCreateUpdateSerializer(data=data)
-        self.assertFalse(serializer.is_valid())
-        self.assertIn("external_id", serializer.errors)
+        self.assertIn("external_id", context.exception.detail)
 
     def test_validate_external_id_update_same_planet(self):
         """Test that updating a planet with its own external_id is valid."""
@@ -292,13 +320,7 @@ class PlanetCreateUpdateSerializerTest(TestCase):
 
     def test_validate_external_id_blank_null(self):
         """Test validation of blank and null external_id."""
-        data = {
-            "external_id": "",
-            "name": "Test Planet",
-            "population": 1000000,
-            "climates": ["temperate"],
-            "terrains": ["forest"],
-        }
+        data = _make_input(external_id="")
 
         serializer = PlanetCreateUpdateSerializer(data=data)
         self.assertTrue(serializer.is_valid())
@@ -306,3 +328,75 @@ class PlanetCreateUpdateSerializerTest(TestCase):
         data["external_id"] = None
         serializer = PlanetCreateUpdateSerializer(data=data)
         self.assertTrue(serializer.is_valid())
+
+    def test_blank_external_id_stored_as_null(self):
+        """Test that several planets can be created with a blank external_id."""
+        for name in ("First Planet", "Second Planet"):
+            with self.subTest(name=name):
+                serializer = PlanetCreateUpdateSerializer(
+                    data=_make_input(name=name, external_id="")
+                )
+                self.assertTrue(serializer.is_valid(), serializer.errors)
+                self.assertIsNone(serializer.save().external_id)
+
+        self.assertEqual(
+            Planet.objects.filter(name__in=["First Planet", "Second Planet"], external_id=None).count(),
+            2,
+        )
+
+
+class PlanetListCreateSerializerTest(TestCase):
+    """Test cases for creating planets in bulk with PlanetCreateUpdateSerializer."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        Planet.objects.create(
+            external_id="existing-123",
+            name="Existing Planet",
+            population=1000000,
+            climates=["temperate"],
+            terrains=["forest"],
+        )
+
+    def test_bulk_validation_prefetches_external_ids(self):
+        """Test that external_id uniqueness is checked with a single query."""
+        data = [
+            {"external_id": f"new-{i}", "name": f"Planet {i}", "population": 1000}
+            for i in range(10)
+        ]
+        data.append({"name": "No External ID", "population": 1000})
+
+        serializer = PlanetCreateUpdateSerializer(data=data, many=True)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid())
+
+        serializer.save()
+        self.assertEqual(Planet.objects.count(), 12)
+
+    def test_bulk_validation_rejects_existing_external_id(self):
+        """Test that an external_id already in the database is rejected."""
+        data = [
+            {"external_id": "new-1", "name": "Planet 1", "population": 1000},
+            {"external_id": "existing-123", "name": "Planet 2", "population": 1000},
+        ]
+
+        serializer = PlanetCreateUpdateSerializer(data=data, many=True)
+
+        self.assertFalse(serializer.is_valid())
+        errors = serializer.errors
+        self.assertEqual(errors[0], {})
+        self.assertIn("external_id", errors[1])
+
+    def test_bulk_validation_rejects_duplicates_in_batch(self):
+        """Test that an external_id repeated within the batch is rejected."""
+        data = [
+            {"external_id": "new-1", "name": "Planet 1", "population": 1000},
+            {"external_id": "new-1", "name": "Planet 2", "population": 1000},
+        ]
+
+        serializer = PlanetCreateUpdateSerializer(data=data, many=True)
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("non_field_errors", serializer.errors)
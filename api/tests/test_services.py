@@ -1,98 +1,137 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from unittest.mock import patch, Mock
-from api.models import Planet
+from api.models import Planet, SyncCursor
+from api.pagination import PLANET_COUNT_CACHE_KEY
+from api.serializers import PlanetCreateUpdateSerializer
 from api.services.graphql_client import GraphQLClient, StarWarsGraphQLClient
 from api.services.data_generator import PlanetDataGenerator
-from api.services.sync_service import PlanetSyncService
+from api.services.sync_service import PlanetRow, PlanetSyncService
+import orjson
+import random
+import re
 import requests
-
-
-class GraphQLClientTest(TestCase):
-    """Test cases for GraphQLClient."""
-
-    @patch("requests.Session")
-    def test_successful_query(self, mock_session_class):
-        """Test successful GraphQL query."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"data": {"test": "value"}}
-        mock_response.raise_for_status.return_value = None
-
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_session_class.return_value = mock_session
-
-        # Create client after patching
-        client = GraphQLClient("https://test-api.com/graphql")
-        result = client.query("query { test }")
-
-        self.assertEqual(result, {"test": "value"})
-        mock_session.post.assert_called_once()
-
-    @patch("requests.Session")
-    @patch("api.services.graphql_client.logger")
-    def test_query_with_errors(self, mock_logger, mock_session_class):
-        """Test GraphQL query with errors in response."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "data": None,
-            "errors": [{"message": "Test error"}],
-        }
-        mock_response.raise_for_status.return_value = None
-
-        mock_session = Mock()
+import unittest
+from types import MappingProxyType
+
+
+# A complete planet as returned by the API; tests derive variants with {**_PLANET_TPL, ...}
+_PLANET_TPL = MappingProxyType(
+    {
+        "id": "test-123",
+        "name": "Test Planet",
+        "population": 1000000,
+        "climates": ["temperate"],
+        "terrains": ["forest"],
+    }
+)
+
+
+def _response(payload):
+    """Build a mocked successful HTTP response carrying `payload` as JSON."""
+    mock_response = Mock()
+    mock_response.content = orjson.dumps(payload)
+    mock_response.raise_for_status.return_value = None
+    return mock_response
+
+
+def _install_session(mock_session_class, *, payload=None, post_side_effect=None):
+    """
+    Wire a patched requests.Session class to a mocked session.
+
+    Returns:
+        Tuple of (mock_session, mock_response); mock_response is None when
+        post_side_effect is given
+    """
+    mock_session = Mock()
+    mock_response = None
+    if post_side_effect is not None:
+        mock_session.post.side_effect = post_side_effect
+    else:
+        mock_response = _response(payload)
         mock_session.post.return_value = mock_response
-        mock_session_class.return_value = mock_session
-
-        # Create client after patching
-        client = GraphQLClient("https://test-api.com/graphql")
-
-        with self.assertRaises(ValueError) as context:
-            client.query("query { test }")
-
-        self.assertIn("Test error", str(context.exception))
-
-    @patch("requests.Session")
-    @patch("api.services.graphql_client.logger")
-    def test_request_exception(self, mock_logger, mock_session_class):
-        """Test handling of request exceptions."""
-        mock_session = Mock()
-        mock_session.post.side_effect = requests.RequestException("Network error")
-        mock_session_class.return_value = mock_session
-
-        # Create client after patching
-        client = GraphQLClient("https://test-api.com/graphql")
-
-        with self.assertRaises(requests.RequestException):
-            client.query("query { test }")
+    mock_session_class.return_value = mock_session
+    return mock_session, mock_response
 
-    @patch("requests.Session")
-    def test_query_with_variables(self, mock_session_class):
-        """Test GraphQL query with variables."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"data": {"test": "value"}}
-        mock_response.raise_for_status.return_value = None
 
-        mock_session = Mock()
-        mock_session.post.return_value = mock_response
-        mock_session_class.return_value = mock_session
-
-        # Create client after patching
-        client = GraphQLClient("https://test-api.com/graphql")
+class GraphQLClientTest(SimpleTestCase):
+    """Test cases for GraphQLClient."""
 
-        variables = {"id": "123"}
-        client.query("query { test }", variables)
+    QUERY_CASES = [
+        # (name, response payload, post side effect, variables, expected exception, expected text)
+        ("success", {"data": {"test": "value"}}, None, None, None, None),
+        (
+            "graphql_errors",
+            {"data": None, "errors": [{"message": "Test error"}]},
+            None,
+            None,
+            ValueError,
+            "Test error",
+        ),
+        (
+            "request_exception",
+            None,
+            requests.RequestException("Network error"),
+            None,
+            requests.RequestException,
+            "Network error",
+        ),
+        ("variables", {"data": {"test": "value"}}, None, {"id": "123"}, None, None),
+    ]
 
-        # Check that variables were included in the request
-        call_args = mock_session.post.call_args
-        self.assertEqual(call_args[1]["json"]["variables"], variables)
+    def setUp(self):
+        """Patch requests.Session and the client logger for every test."""
+        session_patcher = patch("requests.Session")
+        self.mock_session_class = session_patcher.start()
+        self.addCleanup(session_patcher.stop)
+
+        logger_patcher = patch("api.services.graphql_client.logger")
+        logger_patcher.start()
+        self.addCleanup(logger_patcher.stop)
+
+    def test_query(self):
+        """Test GraphQL query results, errors, request failures and variables."""
+        for name, payload, side_effect, variables, exc, text in self.QUERY_CASES:
+            with self.subTest(name=name):
+                mock_session, _ = _install_session(
+                    self.mock_session_class, payload=payload, post_side_effect=side_effect
+                )
+
+                # Create client after patching
+                client = GraphQLClient("https://test-api.com/graphql")
+
+                if exc is not None:
+                    with self.assertRaises(exc) as context:
+                        client.query("query { test }", variables)
+                    self.assertIn(text, str(context.exception))
+                    continue
+
+                result = client.query("query { test }", variables)
+
+                self.assertEqual(result, {"test": "value"})
+                mock_session.post.assert_called_once()
+                # Check that variables were included in the request
+                body = orjson.loads(mock_session.post.call_args[1]["data"])
+                self.assertEqual(body["variables"], variables or {})
+
+
+class StarWarsGraphQLClientTest(SimpleTestCase):
+    """Test cases for StarWarsGraphQLClient."""
 
+    PLANETS_QUERY_FIELDS = frozenset(
+        {"allPlanets", "planets", "id", "name", "population", "climates", "terrains", "edited"}
+    )
 
-class StarWarsGraphQLClientTest(TestCase):
-    """Test cases for StarWarsGraphQLClient."""
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._client = StarWarsGraphQLClient()
 
     def setUp(self):
         """Set up test data."""
-        self.client = StarWarsGraphQLClient()
+        self.client = self._client
 
     def test_client_initialization(self):
         """Test client initialization with correct endpoint."""
@@ -100,18 +139,27 @@ class StarWarsGraphQLClientTest(TestCase):
         self.assertIn("Content-Type", self.client.headers)
         self.assertEqual(self.client.headers["Content-Type"], "application/json")
 
+    def test_session_uses_pooled_adapter(self):
+        """Test that the session mounts an adapter sized by max_connections."""
+        adapter = self.client.session.get_adapter(self.client.endpoint_url)
+
+        self.assertEqual(adapter._pool_maxsize, self.client.max_connections)
+
     def test_get_planets_query(self):
         """Test that planets query is properly formatted."""
         query = self.client.get_planets_query()
 
         self.assertIn("query GetPlanets", query)
-        self.assertIn("allPlanets", query)
-        self.assertIn("planets", query)
-        self.assertIn("id", query)
-        self.assertIn("name", query)
-        self.assertIn("population", query)
-        self.assertIn("climates", query)
-        self.assertIn("terrains", query)
+        # Tokenize once so each field is matched as a whole word
+        missing = self.PLANETS_QUERY_FIELDS - set(re.findall(r"\w+", query))
+        self.assertFalse(missing, f"missing from query: {sorted(missing)}")
+
+    def test_planets_body_precomputed(self):
+        """Test that the planets request body is serialized once up front."""
+        body = orjson.loads(self.client._planets_body)
+
+        self.assertEqual(body["query"], self.client.get_planets_query())
+        self.assertEqual(body["variables"], {})
 
     @patch.object(GraphQLClient, "query")
     def test_fetch_planets(self, mock_query):
@@ -125,12 +173,35 @@ class StarWarsGraphQLClientTest(TestCase):
         result = self.client.fetch_planets()
 
         self.assertEqual(result["allPlanets"]["planets"][0]["name"], "Tatooine")
-        mock_query.assert_called_once()
+        mock_query.assert_called_once_with(
+            self.client.get_planets_query(), body_bytes=self.client._planets_body
+        )
 
+    @patch.object(GraphQLClient, "query")
+    def test_fetch_planet(self, mock_query):
+        """Test fetching a single planet by ID."""
+        mock_query.return_value = {"planet": {"id": "cGxhbmV0czox", "name": "Tatooine"}}
+
+        planet = self.client.fetch_planet("cGxhbmV0czox")
 
-class PlanetDataGeneratorTest(TestCase):
+        self.assertEqual(planet["name"], "Tatooine")
+        mock_query.assert_called_once_with(
+            self.client.get_planet_query(), {"id": "cGxhbmV0czox"}
+        )
+
+        mock_query.return_value = {"planet": None}
+        self.assertIsNone(self.client.fetch_planet("missing"))
+
+
+class PlanetDataGeneratorTest(unittest.TestCase):
     """Test cases for PlanetDataGenerator."""
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Reproducible draws, so a failure can be replayed
+        random.seed(0)
+
     def test_generate_population(self):
         """Test population generation."""
         population = PlanetDataGenerator.generate_population()
@@ -140,6 +211,18 @@ class PlanetDataGeneratorTest(TestCase):
         # Population should be divisible by 1000
         self.assertEqual(population % 1000, 0)
 
+    def test_generate_populations_batch(self):
+        """Test batch population generation."""
+        populations = PlanetDataGenerator.generate_populations_batch(50)
+
+        self.assertEqual(len(populations), 50)
+        for population in populations:
+            self.assertIsInstance(population, int)
+            self.assertGreater(population, 0)
+            self.assertEqual(population % 1000, 0)
+
+        self.assertEqual(PlanetDataGenerator.generate_populations_batch(0), [])
+
     def test_generate_climates(self):
         """Test climate generation."""
         climates = PlanetDataGenerator.generate_climates()
@@ -149,8 +232,7 @@ class PlanetDataGeneratorTest(TestCase):
         self.assertLessEqual(len(climates), 3)
 
         # All climates should be from the predefined list
-        for climate in climates:
-            self.assertIn(climate, PlanetDataGenerator.CLIMATE_TYPES)
+        self.assertTrue(set(climates).issubset(PlanetDataGenerator.CLIMATE_TYPES_SET))
 
     def test_generate_climates_with_count(self):
         """Test climate generation with specific count."""
@@ -169,8 +251,7 @@ class PlanetDataGeneratorTest(TestCase):
         self.assertLessEqual(len(terrains), 4)
 
         # All terrains should be from the predefined list
-        for terrain in terrains:
-            self.assertIn(terrain, PlanetDataGenerator.TERRAIN_TYPES)
+        self.assertTrue(set(terrains).issubset(PlanetDataGenerator.TERRAIN_TYPES_SET))
 
     def test_generate_terrains_with_count(self):
         """Test terrain generation with specific count."""
@@ -180,190 +261,314 @@ class PlanetDataGeneratorTest(TestCase):
         self.assertEqual(len(terrains), count)
         self.assertEqual(len(set(terrains)), count)  # No duplicates
 
-    def test_generate_planet_data_complete(self):
-        """Test generating planet data with complete original data."""
-        original_data = {
-            "id": "test-123",
-            "name": "Test Planet",
-            "population": 1000000,
-            "climates": ["temperate"],
-            "terrains": ["forest"],
-        }
+    def test_generate_climates_batch(self):
+        """Test batch climate generation with random and fixed sizes."""
+        batch = PlanetDataGenerator.generate_climates_batch(20)
 
-        result = PlanetDataGenerator.generate_planet_data("Test Planet", original_data)
+        self.assertEqual(len(batch), 20)
+        for climates in batch:
+            self.assertTrue(1 <= len(climates) <= 3)
+            self.assertEqual(len(set(climates)), len(climates))
+            self.assertTrue(set(climates) <= PlanetDataGenerator.CLIMATE_TYPES_SET)
 
-        # Should return original data unchanged
-        self.assertEqual(result, original_data)
+        batch = PlanetDataGenerator.generate_climates_batch(3, sizes=[1, 2, 99])
+        self.assertEqual([len(c) for c in batch], [1, 2, len(PlanetDataGenerator.CLIMATE_TYPES)])
 
-    def test_generate_planet_data_missing_population(self):
-        """Test generating planet data with missing population."""
-        original_data = {
-            "id": "test-123",
-            "name": "Test Planet",
-            "population": None,
-            "climates": ["temperate"],
-            "terrains": ["forest"],
-        }
+    def test_generate_terrains_batch(self):
+        """Test batch terrain generation."""
+        batch = PlanetDataGenerator.generate_terrains_batch(20)
 
-        result = PlanetDataGenerator.generate_planet_data("Test Planet", original_data)
-
-        self.assertIsNotNone(result["population"])
-        self.assertGreater(result["population"], 0)
-        self.assertEqual(result["climates"], ["temperate"])
-        self.assertEqual(result["terrains"], ["forest"])
-
-    def test_generate_planet_data_missing_climates(self):
-        """Test generating planet data with missing climates."""
-        original_data = {
-            "id": "test-123",
-            "name": "Test Planet",
-            "population": 1000000,
-            "climates": None,
-            "terrains": ["forest"],
-        }
+        self.assertEqual(len(batch), 20)
+        for terrains in batch:
+            self.assertTrue(2 <= len(terrains) <= 4)
+            self.assertEqual(len(set(terrains)), len(terrains))
+            self.assertTrue(set(terrains) <= PlanetDataGenerator.TERRAIN_TYPES_SET)
 
-        result = PlanetDataGenerator.generate_planet_data("Test Planet", original_data)
-
-        self.assertEqual(result["population"], 1000000)
-        self.assertIsInstance(result["climates"], list)
-        self.assertGreater(len(result["climates"]), 0)
-        self.assertEqual(result["terrains"], ["forest"])
-
-    def test_generate_planet_data_missing_terrains(self):
-        """Test generating planet data with missing terrains."""
-        original_data = {
-            "id": "test-123",
-            "name": "Test Planet",
-            "population": 1000000,
-            "climates": ["temperate"],
-            "terrains": None,
-        }
+    def test_generate_planet_data_complete(self):
+        """Test generating planet data with complete original data."""
+        original_data = dict(_PLANET_TPL)
 
         result = PlanetDataGenerator.generate_planet_data("Test Planet", original_data)
 
-        self.assertEqual(result["population"], 1000000)
-        self.assertEqual(result["climates"], ["temperate"])
-        self.assertIsInstance(result["terrains"], list)
-        self.assertGreaterEqual(len(result["terrains"]), 2)
-
-    def test_generate_planet_data_all_missing(self):
-        """Test generating planet data with all optional fields missing."""
-        original_data = {
-            "id": "test-123",
-            "name": "Test Planet",
-            "population": None,
-            "climates": None,
-            "terrains": None,
-        }
-
-        result = PlanetDataGenerator.generate_planet_data("Test Planet", original_data)
+        # Should return original data unchanged
+        self.assertEqual(result, original_data)
 
-        self.assertIsNotNone(result["population"])
-        self.assertGreater(result["population"], 0)
-        self.assertIsInstance(result["climates"], list)
-        self.assertGreater(len(result["climates"]), 0)
-        self.assertIsInstance(result["terrains"], list)
-        self.assertGreaterEqual(len(result["terrains"]), 2)
+    def test_generate_planet_data_missing_fields(self):
+        """Test that exactly the null fields are generated and the rest preserved."""
+        for missing in [
+            ("population",),
+            ("climates",),
+            ("terrains",),
+            ("population", "climates", "terrains"),
+        ]:
+            with self.subTest(missing=missing):
+                original_data = {**_PLANET_TPL, **dict.fromkeys(missing)}
+
+                result = PlanetDataGenerator.generate_planet_data("Test Planet", original_data)
+
+                for field in ("population", "climates", "terrains"):
+                    if field not in missing:
+                        self.assertEqual(result[field], _PLANET_TPL[field])
+                if "population" in missing:
+                    self.assertGreater(result["population"], 0)
+                if "climates" in missing:
+                    self.assertTrue(1 <= len(result["climates"]) <= 3)
+                if "terrains" in missing:
+                    self.assertTrue(2 <= len(result["terrains"]) <= 4)
+
+    def test_fill_missing_fields_rows(self):
+        """Test that attribute-style rows are filled in place like dicts."""
+        rows = [
+            PlanetRow("1", "Tatooine", None, ["arid"], None),
+            PlanetRow("2", "Alderaan", 2000000000, None, ["mountains"]),
+        ]
+
+        result = PlanetDataGenerator.fill_missing_fields(rows)
+
+        self.assertIs(result, rows)
+        self.assertGreater(rows[0].population, 0)
+        self.assertEqual(rows[0].climates, ["arid"])
+        self.assertTrue(2 <= len(rows[0].terrains) <= 4)
+        self.assertEqual(rows[1].population, 2000000000)
+        self.assertTrue(1 <= len(rows[1].climates) <= 3)
+        self.assertEqual(rows[1].terrains, ["mountains"])
 
 
 class PlanetSyncServiceTest(TestCase):
     """Test cases for PlanetSyncService."""
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._sync_service = PlanetSyncService()
+
     def setUp(self):
         """Set up test data."""
-        self.sync_service = PlanetSyncService()
+        self.sync_service = self._sync_service
+        self.sync_service._reset_stats()
+
+        # Last-run stats live on the class; start each test without any
+        stats_patcher = patch.object(PlanetSyncService, "_last_sync_stats", {})
+        stats_patcher.start()
+        self.addCleanup(stats_patcher.stop)
 
     def test_service_initialization(self):
         """Test service initialization."""
         self.assertIsNotNone(self.sync_service.client)
-        self.assertEqual(self.sync_service.stats["created"], 0)
-        self.assertEqual(self.sync_service.stats["updated"], 0)
-        self.assertEqual(self.sync_service.stats["errors"], 0)
-        self.assertEqual(self.sync_service.stats["total_processed"], 0)
+        self.assertEqual(
+            self.sync_service.stats,
+            {"created": 0, "updated": 0, "unchanged": 0, "errors": 0, "total_processed": 0},
+        )
 
     def test_transform_planet_data(self):
         """Test planet data transformation."""
-        planet_data = {
-            "id": "test-123",
-            "name": "Test Planet",
-            "population": 1000000,
-            "climates": ["temperate"],
-            "terrains": ["forest"],
-        }
+        planet_data = dict(_PLANET_TPL)
 
         result = self.sync_service._transform_planet_data(planet_data)
 
-        self.assertEqual(result["external_id"], "test-123")
-        self.assertEqual(result["name"], "Test Planet")
-        self.assertEqual(result["population"], 1000000)
-        self.assertEqual(result["climates"], ["temperate"])
-        self.assertEqual(result["terrains"], ["forest"])
+        self.assertEqual(result.external_id, "test-123")
+        self.assertEqual(result.name, "Test Planet")
+        self.assertEqual(result.population, 1000000)
+        self.assertEqual(result.climates, ["temperate"])
+        self.assertEqual(result.terrains, ["forest"])
 
     def test_transform_planet_data_with_missing_fields(self):
         """Test planet data transformation with missing fields."""
-        planet_data = {
-            "id": "test-123",
-            "name": "Test Planet",
-            "population": None,
-            "climates": None,
-            "terrains": None,
-        }
+        planet_data = {**_PLANET_TPL, "population": None, "climates": None, "terrains": None}
 
         result = self.sync_service._transform_planet_data(planet_data)
 
-        self.assertEqual(result["external_id"], "test-123")
-        self.assertEqual(result["name"], "Test Planet")
-        self.assertIsNotNone(result["population"])
-        self.assertIsInstance(result["climates"], list)
-        self.assertIsInstance(result["terrains"], list)
+        self.assertEqual(result.external_id, "test-123")
+        self.assertEqual(result.name, "Test Planet")
+        self.assertIsNotNone(result.population)
+        self.assertIsInstance(result.climates, list)
+        self.assertIsInstance(result.terrains, list)
+
+    @patch("api.services.sync_service.logger")
+    def test_transform_planets_batch(self, mock_logger):
+        """Test batch transformation fills missing fields and skips bad rows."""
+        planets = [
+            {"id": "1", "name": "Tatooine", "population": 200000},
+            None,
+            {"id": "2", "name": "Hoth", "climates": ["frozen"], "terrains": None},
+        ]
+
+        result = self.sync_service._transform_planets(planets)
+
+        self.assertEqual([r.external_id for r in result], ["1", "2"])
+        self.assertEqual(result[0].population, 200000)
+        self.assertGreater(len(result[0].climates), 0)
+        self.assertGreater(result[1].population, 0)
+        self.assertEqual(result[1].climates, ["frozen"])
+        self.assertGreaterEqual(len(result[1].terrains), 2)
+        self.assertEqual(self.sync_service.stats["errors"], 1)
 
     def test_update_or_create_planet_new(self):
         """Test creating a new planet."""
-        planet_data = {
-            "external_id": "new-123",
-            "name": "New Planet",
-            "population": 2000000,
-            "climates": ["arid"],
-            "terrains": ["desert"],
-        }
+        planet_row = PlanetRow(
+            external_id="new-123",
+            name="New Planet",
+            population=2000000,
+            climates=["arid"],
+            terrains=["desert"],
+        )
 
-        planet, created = self.sync_service._update_or_create_planet(planet_data)
+        # One existence/hash lookup plus one upsert
+        with self.assertNumQueries(2):
+            planet, created = self.sync_service._update_or_create_planet(planet_row)
 
         self.assertTrue(created)
         self.assertEqual(planet.name, "New Planet")
         self.assertEqual(planet.external_id, "new-123")
         self.assertEqual(self.sync_service.stats["created"], 1)
 
-    def test_update_or_create_planet_existing(self):
-        """Test updating an existing planet."""
-        # Create a planet first
-        Planet.objects.create(
-            external_id="existing-123",
-            name="Existing Planet",
-            population=1000000,
-            climates=["temperate"],
-            terrains=["forest"],
+    def test_upsert_existence_check_selects_only_external_id(self):
+        """Test that the existence lookup does not hydrate full planet rows."""
+        planet_row = PlanetRow(
+            external_id="new-123",
+            name="New Planet",
+            population=2000000,
+            climates=["arid"],
+            terrains=["desert"],
         )
 
-        planet_data = {
-            "external_id": "existing-123",
-            "name": "Updated Planet",
-            "population": 3000000,
-            "climates": ["frozen"],
-            "terrains": ["tundra"],
-        }
+        with CaptureQueriesContext(connection) as ctx:
+            self.sync_service._upsert_planets([planet_row])
+
+        select_clause = ctx.captured_queries[0]["sql"].split(" FROM ")[0]
+        self.assertIn('"external_id"', select_clause)
+        for column in ("name", "population", "climates", "terrains"):
+            self.assertNotIn(f'"{column}"', select_clause)
+
+    @override_settings(PLANET_COPY_THRESHOLD=2)
+    @patch("api.services.sync_service.connection")
+    def test_upsert_planets_uses_copy_on_postgresql(self, mock_connection):
+        """Test that large batches on PostgreSQL are loaded through COPY."""
+        mock_connection.vendor = "postgresql"
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = [(10, "1"), (11, "2")]
+        copied = []
+        mock_cursor.copy_expert.side_effect = lambda sql, buffer: copied.append(buffer.read())
+
+        planets, existing = self.sync_service._upsert_planets(
+            [
+                PlanetRow(
+                    external_id=str(i),
+                    name=f"Planet {i}",
+                    population=1000,
+                    climates=["arid"],
+                    terrains=["desert", "canyons"],
+                    content_hash="0123456789abcdef",
+                )
+                for i in (1, 2)
+            ]
+        )
 
-        planet, created = self.sync_service._update_or_create_planet(planet_data)
+        self.assertEqual([p.pk for p in planets], [10, 11])
+        self.assertEqual(existing, set())
+        self.assertEqual(self.sync_service.stats["created"], 2)
+        self.assertEqual(
+            copied[0].splitlines()[0],
+            '1,Planet 1,1000,"[""arid""]","[""desert"",""canyons""]",0123456789abcdef',
+        )
+        merge_sql = mock_cursor.execute.call_args_list[-1][0][0]
+        self.assertIn("ON CONFLICT (external_id) DO UPDATE", merge_sql)
+
+    @override_settings(PLANET_COPY_THRESHOLD=1)
+    @patch("api.services.sync_service.connection")
+    def test_copy_upsert_writes_integer_population(self, mock_connection):
+        """Test that float populations are written to the COPY data as integers."""
+        mock_connection.vendor = "postgresql"
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = [(10, "1")]
+        copied = []
+        mock_cursor.copy_expert.side_effect = lambda sql, buffer: copied.append(buffer.read())
+
+        self.sync_service._upsert_planets(
+            [PlanetRow("1", "Coruscant", 2e9, ["temperate"], ["cityscape"], "0123456789abcdef")]
+        )
 
-        self.assertFalse(created)
-        self.assertEqual(planet.name, "Updated Planet")
-        self.assertEqual(planet.population, 3000000)
-        self.assertEqual(self.sync_service.stats["updated"], 1)
+        self.assertEqual(copied[0].split(",")[2], "2000000000")
+
+    def test_load_stored_hashes_single_query(self):
+        """Test that stored hashes are loaded with one query regardless of input size."""
+        Planet.objects.bulk_create(
+            [
+                Planet(
+                    external_id=str(i),
+                    name=f"Planet {i}",
+                    population=1000,
+                    climates=["arid"],
+                    terrains=["desert"],
+                    content_hash=f"{i:016x}",
+                )
+                for i in range(3)
+            ]
+        )
+
+        for external_ids in (["0"], [str(i) for i in range(100)]):
+            with self.subTest(count=len(external_ids)):
+                with self.assertNumQueries(1):
+                    stored_hashes = self.sync_service._load_stored_hashes(external_ids)
+
+                self.assertEqual(
+                    stored_hashes, {i: f"{int(i):016x}" for i in external_ids if int(i) < 3}
+                )
+
+    def test_upsert_planets_skips_unchanged_payload(self):
+        """Test that rows whose content hash matches the stored one are not rewritten."""
+        planet_data = {"id": "hash-1", "name": "Hoth", "population": None}
+        self.sync_service._upsert_planets(self.sync_service._transform_planets([planet_data]))
+        stored = Planet.objects.get(external_id="hash-1")
+        self.assertEqual(len(stored.content_hash), 16)
+
+        with self.assertNumQueries(1):
+            planets, existing = self.sync_service._upsert_planets(
+                self.sync_service._transform_planets([planet_data])
+            )
+
+        self.assertEqual(planets, [])
+        self.assertEqual(existing, {"hash-1"})
+        self.assertEqual(self.sync_service.stats["unchanged"], 1)
+        # Generated values from the first sync are kept
+        self.assertEqual(
+            Planet.objects.get(external_id="hash-1").population, stored.population
+        )
+
+    @patch.object(StarWarsGraphQLClient, "fetch_planet")
+    @patch("api.services.sync_service.logger")
+    def test_sync_single_planet(self, mock_logger, mock_fetch_planet):
+        """Test that a single planet is inserted, then updated, with one statement each."""
+        mock_fetch_planet.return_value = dict(_PLANET_TPL)
+        cache.set(PLANET_COUNT_CACHE_KEY, 0)
+
+        with self.assertNumQueries(1):
+            planet = self.sync_service.sync_single_planet("test-123")
+
+        self.assertIsNotNone(planet.pk)
+        self.assertEqual(Planet.objects.get(external_id="test-123").name, "Test Planet")
+        self.assertIsNone(cache.get(PLANET_COUNT_CACHE_KEY))
+        mock_fetch_planet.assert_called_once_with("test-123")
+
+        mock_fetch_planet.return_value = {**_PLANET_TPL, "name": "Renamed Planet"}
+        with self.assertNumQueries(1):
+            self.sync_service.sync_single_planet("test-123")
+
+        self.assertEqual(Planet.objects.get(pk=planet.pk).name, "Renamed Planet")
+        self.assertEqual(Planet.objects.count(), 1)
+
+    @patch.object(StarWarsGraphQLClient, "fetch_planet", return_value=None)
+    @patch("api.services.sync_service.logger")
+    def test_sync_single_planet_not_found(self, mock_logger, mock_fetch_planet):
+        """Test that an unknown planet ID writes nothing and returns None."""
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.sync_service.sync_single_planet("missing"))
+
+        mock_logger.warning.assert_called_once()
 
-    @patch.object(PlanetSyncService, "_update_or_create_planet")
     @patch.object(StarWarsGraphQLClient, "fetch_planets")
     @patch("api.services.sync_service.logger")
-    def test_sync_planets_success(self, mock_logger, mock_fetch_planets, mock_update_create):
+    def test_sync_planets_success(self, mock_logger, mock_fetch_planets):
         """Test successful planet synchronization."""
         mock_fetch_planets.return_value = {
             "allPlanets": {
@@ -374,21 +579,205 @@ class PlanetSyncServiceTest(TestCase):
             }
         }
 
-        # Mock the _update_or_create_planet method to update stats
-        def mock_update_create_side_effect(planet_data):
-            # Simulate the stats update that happens in the real method
-            self.sync_service.stats["created"] += 1
-            return (Mock(), True)  # (planet, created)
-
-        mock_update_create.side_effect = mock_update_create_side_effect
+        cache.set(PLANET_COUNT_CACHE_KEY, 0)
 
-        stats = self.sync_service.sync_planets()
+        # Cursor get_or_create (SELECT + INSERT), the existence lookup and one
+        # upsert, plus the savepoints opened by the two atomic blocks
+        with self.assertNumQueries(8):
+            stats = self.sync_service.sync_planets()
 
         self.assertEqual(stats["total_processed"], 2)
         self.assertEqual(stats["created"], 2)
         self.assertEqual(stats["errors"], 0)
+        self.assertEqual(Planet.objects.count(), 2)
+        # Created planets invalidate the cached list count
+        self.assertIsNone(cache.get(PLANET_COUNT_CACHE_KEY))
         mock_fetch_planets.assert_called_once()
-        self.assertEqual(mock_update_create.call_count, 2)
+        mock_logger.info.assert_called_with(
+            "Sync complete: created=%d updated=%d unchanged=%d errors=%d total_processed=%d",
+            2, 0, 0, 0, 2,
+        )
+
+    @patch.object(StarWarsGraphQLClient, "fetch_planets")
+    @patch("api.services.sync_service.logger")
+    def test_last_sync_stats_shared_and_isolated(self, mock_logger, mock_fetch_planets):
+        """Test that completed syncs publish a copy of their stats that other instances read."""
+        mock_fetch_planets.return_value = {
+            "allPlanets": {"planets": [{"id": "1", "name": "Tatooine", "population": 200000}]}
+        }
+        other = PlanetSyncService(client=self.sync_service.client)
+
+        stats = self.sync_service.sync_planets(full=True)
+        # Starting another sync does not touch the first one's counters or the published ones
+        other._reset_stats()
+        other.stats["errors"] += 1
+
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual(other.get_sync_status()["last_sync_stats"], stats)
+        self.assertIsNot(PlanetSyncService.last_sync_stats(), self.sync_service.stats)
+
+    @patch.object(StarWarsGraphQLClient, "fetch_planets")
+    @patch("api.services.sync_service.logger")
+    def test_sync_planets_uses_bulk_upsert(self, mock_logger, mock_fetch_planets):
+        """Test that the number of queries does not grow with the number of planets."""
+        mock_fetch_planets.return_value = {
+            "allPlanets": {
+                "planets": [
+                    {"id": str(i), "name": f"Planet {i}", "population": 1000}
+                    for i in range(50)
+                ]
+            }
+        }
+
+        # Same count as a two-planet sync: one lookup per sync and one upsert per batch
+        with self.assertNumQueries(8):
+            stats = self.sync_service.sync_planets()
+
+        self.assertEqual(stats["created"], 50)
+        self.assertEqual(Planet.objects.count(), 50)
+
+    @override_settings(PLANET_BULK_BATCH=2)
+    @patch.object(StarWarsGraphQLClient, "fetch_planets")
+    @patch("api.services.sync_service.logger")
+    def test_sync_planets_in_chunks(self, mock_logger, mock_fetch_planets):
+        """Test that synchronization transforms and upserts in fixed-size chunks."""
+        mock_fetch_planets.return_value = {
+            "allPlanets": {
+                "planets": [
+                    {"id": str(i), "name": f"Planet {i}", "population": 1000}
+                    for i in range(5)
+                ]
+            }
+        }
+
+        with patch.object(
+            self.sync_service, "_upsert_planets", wraps=self.sync_service._upsert_planets
+        ) as mock_upsert, CaptureQueriesContext(connection) as ctx:
+            stats = self.sync_service.sync_planets()
+
+        self.assertEqual(
+            [len(c.args[0]) for c in mock_upsert.call_args_list], [2, 2, 1]
+        )
+        # Stored hashes are loaded once for the sync, not once per chunk
+        lookups = [q for q in ctx.captured_queries if '"content_hash" FROM' in q["sql"]]
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual(stats["total_processed"], 5)
+        self.assertEqual(stats["created"], 5)
+        self.assertEqual(Planet.objects.count(), 5)
+
+    @patch.object(StarWarsGraphQLClient, "fetch_planets")
+    @patch("api.services.sync_service.logger")
+    def test_sync_planets_updates_existing(self, mock_logger, mock_fetch_planets):
+        """Test that synchronization upserts planets that already exist."""
+        Planet.objects.create(
+            external_id="1",
+            name="Old Tatooine",
+            population=1000,
+            climates=["arid"],
+            terrains=["desert"],
+        )
+        mock_fetch_planets.return_value = {
+            "allPlanets": {
+                "planets": [
+                    {"id": "1", "name": "Tatooine", "population": 200000},
+                    {"id": "2", "name": "Alderaan", "population": 2000000000},
+                ]
+            }
+        }
+
+        stats = self.sync_service.sync_planets()
+
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual(stats["updated"], 1)
+        self.assertEqual(Planet.objects.count(), 2)
+        self.assertEqual(Planet.objects.get(external_id="1").name, "Tatooine")
+
+    @patch.object(StarWarsGraphQLClient, "fetch_planets")
+    @patch("api.services.sync_service.logger")
+    def test_sync_planets_incremental(self, mock_logger, mock_fetch_planets):
+        """Test that planets not edited since the last sync are skipped."""
+        mock_fetch_planets.return_value = {
+            "allPlanets": {
+                "planets": [
+                    {"id": "1", "name": "Tatooine", "edited": "2014-12-20T20:58:18.411000Z"},
+                    {"id": "2", "name": "Alderaan", "edited": "2014-12-20T20:58:18.420000Z"},
+                ]
+            }
+        }
+
+        stats = self.sync_service.sync_planets()
+        self.assertEqual(stats["created"], 2)
+        self.assertEqual(
+            SyncCursor.objects.get(name="planets").cursor, "2014-12-20T20:58:18.420000Z"
+        )
+
+        # Only the planet edited after the cursor is processed again
+        mock_fetch_planets.return_value["allPlanets"]["planets"][0].update(
+            edited="2015-01-01T00:00:00.000000Z", population=200000
+        )
+        stats = self.sync_service.sync_planets()
+
+        self.assertEqual(stats["total_processed"], 1)
+        self.assertEqual(stats["updated"], 1)
+        self.assertEqual(
+            SyncCursor.objects.get(name="planets").cursor, "2015-01-01T00:00:00.000000Z"
+        )
+
+        # A full sync ignores the cursor but skips rows whose payload is unchanged
+        stats = self.sync_service.sync_planets(full=True)
+        self.assertEqual(stats["total_processed"], 2)
+        self.assertEqual(stats["unchanged"], 2)
+        self.assertEqual(stats["updated"], 0)
+
+    @patch.object(StarWarsGraphQLClient, "fetch_planets")
+    @patch("api.services.sync_service.logger")
+    def test_sync_planets_incremental_restores_local_edits(self, mock_logger, mock_fetch_planets):
+        """Test that an incremental sync restores planets edited locally behind the cursor."""
+        mock_fetch_planets.return_value = {
+            "allPlanets": {
+                "planets": [
+                    {"id": "1", "name": "Tatooine", "edited": "2014-12-20T20:58:18.411000Z"},
+                    {"id": "2", "name": "Alderaan", "edited": "2014-12-20T20:58:18.420000Z"},
+                ]
+            }
+        }
+        self.sync_service.sync_planets()
+
+        planet = Planet.objects.get(external_id="1")
+        serializer = PlanetCreateUpdateSerializer(planet, data={"name": "Edited locally"}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        # Neither planet moved past the cursor upstream, but the local edit is undone
+        stats = self.sync_service.sync_planets()
+
+        self.assertEqual(stats["total_processed"], 1)
+        self.assertEqual(stats["updated"], 1)
+        planet.refresh_from_db()
+        self.assertEqual(planet.name, "Tatooine")
+        self.assertNotEqual(planet.content_hash, "")
+
+    @patch.object(StarWarsGraphQLClient, "fetch_planets")
+    @patch("api.services.sync_service.logger")
+    def test_sync_planets_incremental_restores_local_deletes(self, mock_logger, mock_fetch_planets):
+        """Test that an incremental sync recreates planets deleted locally behind the cursor."""
+        mock_fetch_planets.return_value = {
+            "allPlanets": {
+                "planets": [
+                    {"id": "1", "name": "Tatooine", "edited": "2014-12-20T20:58:18.411000Z"},
+                    {"id": "2", "name": "Alderaan", "edited": "2014-12-20T20:58:18.420000Z"},
+                ]
+            }
+        }
+        self.sync_service.sync_planets()
+
+        Planet.objects.get(external_id="1").delete()
+
+        stats = self.sync_service.sync_planets()
+
+        self.assertEqual(stats["total_processed"], 1)
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual(Planet.objects.get(external_id="1").name, "Tatooine")
 
     @patch.object(StarWarsGraphQLClient, "fetch_planets")
     @patch("api.services.sync_service.logger")
@@ -416,24 +805,97 @@ class PlanetSyncServiceTest(TestCase):
         """Test getting sync status with empty database."""
         status_data = self.sync_service.get_sync_status()
 
-        self.assertEqual(status_data["total_planets_in_db"], 0)
-        self.assertIsNone(status_data["last_updated_planet"])
-        self.assertIsNone(status_data["last_sync_time"])
+        self.assertEqual(
+            status_data,
+            {
+                "total_planets_in_db": 0,
+                "last_updated_planet": None,
+                "last_sync_time": None,
+                "last_sync_stats": {},
+            },
+        )
 
-    def test_get_sync_status_with_planets(self):
-        """Test getting sync status with planets in database."""
-        # Create a planet
+    def test_get_sync_status_returns_latest_planet(self):
+        """Test that sync status reports the most recently updated planet."""
         Planet.objects.create(
-            external_id="test-123",
-            name="Test Planet",
+            external_id="old-123",
+            name="Old Planet",
+            population=1000000,
+            climates=["temperate"],
+            terrains=["forest"],
+        )
+        latest = Planet.objects.create(
+            external_id="new-123",
+            name="New Planet",
             population=1000000,
             climates=["temperate"],
             terrains=["forest"],
         )
 
+        with self.assertNumQueries(2):
+            status_data = self.sync_service.get_sync_status()
+
+        self.assertEqual(status_data["total_planets_in_db"], 2)
+        self.assertEqual(status_data["last_updated_planet"], "New Planet")
+        self.assertEqual(status_data["last_sync_time"], latest.updated_at)
+
+
+class PlanetSyncServiceExistingPlanetTest(TestCase):
+    """Test cases for PlanetSyncService against an already synced planet."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        cls.existing = Planet.objects.bulk_create(
+            [
+                Planet(
+                    external_id="existing-123",
+                    name="Existing Planet",
+                    population=1000000,
+                    climates=["temperate"],
+                    terrains=["forest"],
+                )
+            ]
+        )
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._sync_service = PlanetSyncService()
+
+    def setUp(self):
+        """Set up test data."""
+        self.sync_service = self._sync_service
+        self.sync_service._reset_stats()
+
+        # Last-run stats live on the class; start each test without any
+        stats_patcher = patch.object(PlanetSyncService, "_last_sync_stats", {})
+        stats_patcher.start()
+        self.addCleanup(stats_patcher.stop)
+
+    def test_update_or_create_planet_existing(self):
+        """Test updating an existing planet."""
+        planet_row = PlanetRow(
+            external_id="existing-123",
+            name="Updated Planet",
+            population=3000000,
+            climates=["frozen"],
+            terrains=["tundra"],
+        )
+
+        with self.assertNumQueries(2):
+            planet, created = self.sync_service._update_or_create_planet(planet_row)
+
+        self.assertFalse(created)
+        self.assertEqual(planet.name, "Updated Planet")
+        self.assertEqual(planet.population, 3000000)
+        self.assertEqual(self.sync_service.stats["updated"], 1)
+
+    def test_get_sync_status_with_planets(self):
+        """Test getting sync status with planets in database."""
         status_data = self.sync_service.get_sync_status()
 
         self.assertEqual(status_data["total_planets_in_db"], 1)
-        self.assertEqual(status_data["last_updated_planet"], "Test Planet")
+        self.assertEqual(status_data["last_updated_planet"], "Existing Planet")
         self.assertIsNotNone(status_data["last_sync_time"])
-        self.assertEqual(status_data["last_sync_stats"], self.sync_service.stats)
+        self.assertEqual(status_data["last_sync_stats"], {})
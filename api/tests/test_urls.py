@@ -1,19 +1,19 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 from django.urls import reverse, resolve
-from rest_framework.test import APIClient
-from rest_framework import status
 
+# The test runner sets Django up before importing test modules
+_LIST_URL = reverse("api:planet-list")
+_DETAIL_URL_1 = reverse("api:planet-detail", args=[1])
+_SYNC_URL = reverse("api:planet-sync-planets")
+_SYNC_STATUS_URL = reverse("api:planet-sync-status")
 
-class URLTest(TestCase):
-    """Test cases for URL routing."""
 
-    def setUp(self):
-        """Set up test client."""
-        self.client = APIClient()
+class URLTest(SimpleTestCase):
+    """Test cases for URL routing."""
 
     def test_planet_list_url(self):
         """Test planet list URL resolution."""
-        url = reverse("api:planet-list")
+        url = _LIST_URL
         self.assertEqual(url, "/api/planets/")
 
         # Test URL resolution
@@ -23,7 +23,7 @@ class URLTest(TestCase):
 
     def test_planet_detail_url(self):
         """Test planet detail URL resolution."""
-        url = reverse("api:planet-detail", args=[1])
+        url = _DETAIL_URL_1
         self.assertEqual(url, "/api/planets/1/")
 
         # Test URL resolution
@@ -34,7 +34,7 @@ class URLTest(TestCase):
 
     def test_planet_sync_url(self):
         """Test planet sync URL resolution."""
-        url = reverse("api:planet-sync-planets")
+        url = _SYNC_URL
         self.assertEqual(url, "/api/planets/sync/")
 
         # Test URL resolution
@@ -44,7 +44,7 @@ class URLTest(TestCase):
 
     def test_planet_sync_status_url(self):
         """Test planet sync status URL resolution."""
-        url = reverse("api:planet-sync-status")
+        url = _SYNC_STATUS_URL
         self.assertEqual(url, "/api/planets/sync-status/")
 
         # Test URL resolution
@@ -53,119 +53,88 @@ class URLTest(TestCase):
         self.assertEqual(resolver_match.url_name, "planet-sync-status")
 
     def test_url_patterns_accessible(self):
-        """Test that all URL patterns are accessible."""
-        # Test list endpoint
-        response = self.client.get("/api/planets/")
-        self.assertNotEqual(response.status_code, status.HTTP_404_NOT_FOUND)
-
-        # Test detail endpoint (should return 404 for non-existent planet)
-        response = self.client.get("/api/planets/99999/")
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
-
-        # Test sync endpoint
-        response = self.client.post("/api/planets/sync/")
-        self.assertNotEqual(response.status_code, status.HTTP_404_NOT_FOUND)
-
-        # Test sync status endpoint
-        response = self.client.get("/api/planets/sync-status/")
-        self.assertNotEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        """Test that all URL patterns resolve to a view."""
+        for path in [
+            "/api/planets/",
+            "/api/planets/99999/",
+            "/api/planets/sync/",
+            "/api/planets/sync-status/",
+        ]:
+            with self.subTest(path=path):
+                self.assertIsNotNone(resolve(path).func)
 
     def test_url_methods_allowed(self):
         """Test that URL patterns allow correct HTTP methods."""
-        # Test list endpoint methods
-        response = self.client.get("/api/planets/")
-        self.assertNotEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
-
-        response = self.client.post("/api/planets/", {}, format="json")
-        self.assertNotEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
-
-        # Test detail endpoint methods
-        response = self.client.get("/api/planets/99999/")
-        self.assertNotEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
-
-        response = self.client.put("/api/planets/99999/", {}, format="json")
-        self.assertNotEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
-
-        response = self.client.patch("/api/planets/99999/", {}, format="json")
-        self.assertNotEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
-
-        response = self.client.delete("/api/planets/99999/")
-        self.assertNotEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
-
-        # Test sync endpoint methods
-        response = self.client.post("/api/planets/sync/")
-        self.assertNotEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
-
-        # Sync endpoint should not allow GET
-        response = self.client.get("/api/planets/sync/")
-        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
-
-        # Test sync status endpoint methods
-        response = self.client.get("/api/planets/sync-status/")
-        self.assertNotEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
-
-        # Sync status endpoint should not allow POST
-        response = self.client.post("/api/planets/sync-status/")
-        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        # The router maps each allowed HTTP method to a viewset action. DRF adds
+        # "head" to the shared mapping on the first GET dispatch, so ignore it.
+        expected_methods = {
+            "/api/planets/": {"get", "post"},
+            "/api/planets/99999/": {"get", "put", "patch", "delete"},
+            "/api/planets/sync/": {"post"},
+            "/api/planets/sync-status/": {"get"},
+        }
+
+        for path, methods in expected_methods.items():
+            with self.subTest(path=path):
+                self.assertEqual(set(resolve(path).func.actions) - {"head"}, methods)
 
     def test_url_namespace(self):
         """Test that URLs are properly namespaced."""
         # Test that URLs are in the 'api' namespace
-        list_url = reverse("api:planet-list")
+        list_url = _LIST_URL
         self.assertIn("/api/", list_url)
 
-        detail_url = reverse("api:planet-detail", args=[1])
+        detail_url = _DETAIL_URL_1
         self.assertIn("/api/", detail_url)
 
-        sync_url = reverse("api:planet-sync-planets")
+        sync_url = _SYNC_URL
         self.assertIn("/api/", sync_url)
 
-        sync_status_url = reverse("api:planet-sync-status")
+        sync_status_url = _SYNC_STATUS_URL
         self.assertIn("/api/", sync_status_url)
 
     def test_url_parameters(self):
         """Test URL parameter handling."""
         # Test different planet IDs
-        for planet_id in [1, 123, 99999]:
-            url = reverse("api:planet-detail", args=[planet_id])
-            self.assertEqual(url, f"/api/planets/{planet_id}/")
-
-            resolver_match = resolve(f"/api/planets/{planet_id}/")
-            self.assertEqual(resolver_match.kwargs["pk"], str(planet_id))
+        for planet_id in (1, 123, 99999):
+            expected = f"/api/planets/{planet_id}/"
+            with self.subTest(planet_id=planet_id):
+                self.assertEqual(reverse("api:planet-detail", args=[planet_id]), expected)
+                self.assertEqual(resolve(expected).kwargs["pk"], str(planet_id))
 
     def test_url_trailing_slashes(self):
         """Test URL trailing slash handling."""
         # Test that URLs have proper trailing slashes
-        list_url = reverse("api:planet-list")
+        list_url = _LIST_URL
         self.assertTrue(list_url.endswith("/"))
 
-        detail_url = reverse("api:planet-detail", args=[1])
+        detail_url = _DETAIL_URL_1
         self.assertTrue(detail_url.endswith("/"))
 
-        sync_url = reverse("api:planet-sync-planets")
+        sync_url = _SYNC_URL
         self.assertTrue(sync_url.endswith("/"))
 
-        sync_status_url = reverse("api:planet-sync-status")
+        sync_status_url = _SYNC_STATUS_URL
         self.assertTrue(sync_status_url.endswith("/"))
 
     def test_url_reverse_consistency(self):
         """Test that URL reverse and resolve are consistent."""
         # Test list URL
-        list_url = reverse("api:planet-list")
+        list_url = _LIST_URL
         resolver_match = resolve(list_url)
         self.assertEqual(resolver_match.url_name, "planet-list")
 
         # Test detail URL
-        detail_url = reverse("api:planet-detail", args=[1])
+        detail_url = _DETAIL_URL_1
         resolver_match = resolve(detail_url)
         self.assertEqual(resolver_match.url_name, "planet-detail")
 
         # Test sync URL
-        sync_url = reverse("api:planet-sync-planets")
+        sync_url = _SYNC_URL
         resolver_match = resolve(sync_url)
         self.assertEqual(resolver_match.url_name, "planet-sync-planets")
 
         # Test sync status URL
-        sync_status_url = reverse("api:planet-sync-status")
+        sync_status_url = _SYNC_STATUS_URL
         resolver_match = resolve(sync_status_url)
         self.assertEqual(resolver_match.url_name, "planet-sync-status")
@@ -1,19 +1,23 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from unittest.mock import patch, Mock
 from api.models import Planet
 from api import views
+import orjson
 
 
 class PlanetViewSetTest(TestCase):
     """Test cases for PlanetViewSet."""
 
-    def setUp(self):
-        """Set up test data and client."""
-        self.client = APIClient()
-        self.planet = Planet.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Create the planet shared by every test in the class."""
+        cls.planet = Planet.objects.create(
             external_id="test-123",
             name="Test Planet",
             population=1000000,
@@ -21,6 +25,11 @@ class PlanetViewSetTest(TestCase):
             terrains=["forest", "mountains"],
         )
 
+    def setUp(self):
+        """Set up the client and clear cached list counts."""
+        cache.clear()
+        self.client = APIClient()
+
     def test_list_planets(self):
         """Test listing all planets."""
         url = reverse("api:planet-list")
@@ -40,17 +49,50 @@ class PlanetViewSetTest(TestCase):
         self.assertNotIn("created_at", response.data["results"][0])
         self.assertNotIn("updated_at", response.data["results"][0])
 
+    def test_list_planets_lite(self):
+        """Test lite list responses omit climates and terrains."""
+        url = reverse("api:planet-list")
+        response = self.client.get(url, {"lite": "1"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.data["results"][0]
+        self.assertEqual(
+            set(result), {"id", "external_id", "name", "population"}
+        )
+        self.assertEqual(result["name"], "Test Planet")
+
+    def test_list_planets_selects_serialized_columns_only(self):
+        """Test that list requests do not load columns the serializer drops."""
+        unrendered = ["content_hash", "created_at", "updated_at"]
+        for params, loaded, skipped in [
+            ({}, ["name", "climates", "terrains"], unrendered),
+            ({"lite": "1"}, ["name"], ["climates", "terrains", *unrendered]),
+        ]:
+            with self.subTest(params=params):
+                with CaptureQueriesContext(connection) as ctx:
+                    self.client.get(reverse("api:planet-list"), params)
+
+                row_query = ctx.captured_queries[-1]["sql"]
+                for column in loaded:
+                    self.assertIn(f'"{column}"', row_query)
+                for column in skipped:
+                    self.assertNotIn(f'"{column}"', row_query)
+
     def test_list_planets_pagination(self):
         """Test pagination functionality."""
         # Create multiple planets for pagination testing
-        for i in range(25):  # More than the default page size of 20
-            Planet.objects.create(
-                external_id=f"test-{i}",
-                name=f"Planet {i}",
-                population=1000000 + i,
-                climates=["temperate"],
-                terrains=["forest"],
-            )
+        Planet.objects.bulk_create(
+            [
+                Planet(
+                    external_id=f"test-{i}",
+                    name=f"Planet {i}",
+                    population=1000000 + i,
+                    climates=["temperate"],
+                    terrains=["forest"],
+                )
+                for i in range(25)  # More than the default page size of 20
+            ]
+        )
 
         url = reverse("api:planet-list")
         response = self.client.get(url)
@@ -68,29 +110,162 @@ class PlanetViewSetTest(TestCase):
         self.assertIsNone(response.data["next"])
         self.assertIsNotNone(response.data["previous"])
 
-    def test_search_planets_by_name(self):
-        """Test searching planets by name."""
-        # Create planets with different names
-        Planet.objects.create(
-            external_id="tatooine-123",
-            name="Tatooine",
-            population=200000,
-            climates=["arid"],
-            terrains=["desert"],
+    def test_list_planets_pagination_loads_page_by_pk(self):
+        """Test that only the rows on the requested page are fully loaded."""
+        Planet.objects.bulk_create(
+            [
+                Planet(
+                    external_id=f"test-{i}",
+                    name=f"Planet {i}",
+                    population=1000000 + i,
+                    climates=["temperate"],
+                    terrains=["forest"],
+                )
+                for i in range(25)
+            ]
         )
-        Planet.objects.create(
-            external_id="naboo-123",
-            name="Naboo",
-            population=4500000000,
-            climates=["temperate"],
-            terrains=["grassy hills", "swamps"],
+
+        # ETag MAX(updated_at), COUNT, the page of primary keys, then the rows for those keys
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("api:planet-list"), {"page": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [planet["name"] for planet in response.data["results"]],
+            ["Planet 5", "Planet 6", "Planet 7", "Planet 8", "Planet 9", "Test Planet"],
+        )
+        self.assertEqual(len(ctx.captured_queries), 4)
+        pk_query, row_query = (q["sql"] for q in ctx.captured_queries[2:])
+        self.assertIn("OFFSET", pk_query)
+        self.assertNotIn('"climates"', pk_query)
+        self.assertNotIn("OFFSET", row_query)
+        self.assertIn(" IN (", row_query)
+
+    def test_list_planets_cursor_pagination(self):
+        """Test cursor pagination when a cursor parameter is given."""
+        Planet.objects.bulk_create(
+            [
+                Planet(
+                    external_id=f"test-{i}",
+                    name=f"Planet {i:02d}",
+                    population=1000000 + i,
+                    climates=["temperate"],
+                    terrains=["forest"],
+                )
+                for i in range(25)
+            ]
+        )
+
+        response = self.client.get(reverse("api:planet-list"), {"cursor": ""})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertIsNone(response.data["previous"])
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(
+            [planet["name"] for planet in response.data["results"]],
+            ["Planet 20", "Planet 21", "Planet 22", "Planet 23", "Planet 24", "Test Planet"],
+        )
+        self.assertIsNone(response.data["next"])
+        # Seeks past the previous page's name instead of counting and skipping rows;
+        # the other query is the ETag's MAX(updated_at)
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertNotIn("OFFSET", ctx.captured_queries[-1]["sql"])
+
+    def test_list_planets_stream(self):
+        """Test that ?stream=1 returns every matching planet as one JSON array."""
+        Planet.objects.bulk_create(
+            [
+                Planet(
+                    external_id=f"test-{i}",
+                    name=f"Planet {i:02d}",
+                    population=1000000 + i,
+                    climates=["temperate"],
+                    terrains=["forest"],
+                )
+                for i in range(25)
+            ]
+        )
+        url = reverse("api:planet-list")
+
+        response = self.client.get(url, {"stream": "1"})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/json")
+        planets = orjson.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(planets), 26)  # Not limited to one page
+        self.assertEqual(planets[0]["name"], "Planet 00")
+        self.assertEqual(planets[0]["climates"], ["temperate"])
+        self.assertEqual(
+            set(planets[-1]), {"id", "external_id", "name", "population", "climates", "terrains"}
         )
+
+        response = self.client.get(url, {"stream": "1", "lite": "1", "search": "test"})
+        self.assertEqual(
+            orjson.loads(b"".join(response.streaming_content)),
+            [
+                {
+                    "id": self.planet.id,
+                    "external_id": "test-123",
+                    "name": "Test Planet",
+                    "population": 1000000,
+                }
+            ],
+        )
+
+    def test_list_planets_caches_unfiltered_count(self):
+        """Test that the unfiltered count is cached until a planet is created or deleted."""
+        url = reverse("api:planet-list")
+        self.client.get(url)
+
+        # ETag MAX(updated_at), page of primary keys and page rows; COUNT comes from the cache
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.data["count"], 1)
+
+        # Searches are always counted exactly
+        with self.assertNumQueries(4):
+            self.client.get(url, {"search": "test"})
+
         Planet.objects.create(
-            external_id="hoth-123",
-            name="Hoth",
-            population=0,
-            climates=["frozen"],
-            terrains=["tundra", "ice caves"],
+            name="Second Planet", population=1, climates=["arid"], terrains=["desert"]
+        )
+        self.assertEqual(self.client.get(url).data["count"], 2)
+
+        self.planet.delete()
+        self.assertEqual(self.client.get(url).data["count"], 1)
+
+    def test_search_planets_by_name(self):
+        """Test searching planets by name."""
+        # Create planets with different names
+        Planet.objects.bulk_create(
+            [
+                Planet(
+                    external_id="tatooine-123",
+                    name="Tatooine",
+                    population=200000,
+                    climates=["arid"],
+                    terrains=["desert"],
+                ),
+                Planet(
+                    external_id="naboo-123",
+                    name="Naboo",
+                    population=4500000000,
+                    climates=["temperate"],
+                    terrains=["grassy hills", "swamps"],
+                ),
+                Planet(
+                    external_id="hoth-123",
+                    name="Hoth",
+                    population=0,
+                    climates=["frozen"],
+                    terrains=["tundra", "ice caves"],
+                ),
+            ]
         )
 
         # Test exact search
@@ -122,28 +297,37 @@ class PlanetViewSetTest(TestCase):
     def test_search_planets_empty_query(self):
         """Test search with empty query parameter."""
         url = reverse("api:planet-list")
-        response = self.client.get(url, {"search": ""})
+        for search in ("", "   "):
+            with self.subTest(search=search):
+                with CaptureQueriesContext(connection) as ctx:
+                    response = self.client.get(url, {"search": search})
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        # Should return all planets (no filtering)
-        self.assertGreater(response.data["count"], 0)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                # Should return all planets (no filtering)
+                self.assertEqual(response.data["count"], 1)
+                for query in ctx.captured_queries:
+                    self.assertNotIn("LIKE", query["sql"])
 
     def test_list_planets_ordering(self):
         """Test that planets are ordered by name."""
         # Create planets with different names
-        Planet.objects.create(
-            external_id="z-planet",
-            name="Zeta Planet",
-            population=1000000,
-            climates=["temperate"],
-            terrains=["forest"],
-        )
-        Planet.objects.create(
-            external_id="a-planet",
-            name="Alpha Planet",
-            population=1000000,
-            climates=["temperate"],
-            terrains=["forest"],
+        Planet.objects.bulk_create(
+            [
+                Planet(
+                    external_id="z-planet",
+                    name="Zeta Planet",
+                    population=1000000,
+                    climates=["temperate"],
+                    terrains=["forest"],
+                ),
+                Planet(
+                    external_id="a-planet",
+                    name="Alpha Planet",
+                    population=1000000,
+                    climates=["temperate"],
+                    terrains=["forest"],
+                ),
+            ]
         )
 
         url = reverse("api:planet-list")
@@ -168,6 +352,68 @@ class PlanetViewSetTest(TestCase):
         self.assertIn("created_at", response.data)
         self.assertIn("updated_at", response.data)
 
+    def test_retrieve_planet_single_pk_query(self):
+        """Test that retrieve loads the planet with unordered primary key lookups."""
+        url = reverse("api:planet-detail", args=[self.planet.id])
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+
+        # The ETag's updated_at lookup, then the planet itself
+        self.assertEqual(len(ctx.captured_queries), 2)
+        for query in ctx.captured_queries:
+            self.assertIn('"planets"."id" = ', query["sql"])
+            self.assertNotIn("ORDER BY", query["sql"])
+
+    def test_retrieve_planet_conditional_get(self):
+        """Test that retrieve answers 304 until the planet changes."""
+        url = reverse("api:planet-detail", args=[self.planet.id])
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.planet.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        response = self.client.get(reverse("api:planet-detail", args=[99999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_planets_conditional_get(self):
+        """Test that the list answers 304 until a planet is written, created or deleted."""
+        url = reverse("api:planet-list")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        other = Planet.objects.create(
+            name="Second Planet", population=1, climates=["arid"], terrains=["desert"]
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        other.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Deleting a planet other than the latest one bumps the list version
+        older = Planet.objects.create(
+            name="Older Planet", population=1, climates=["arid"], terrains=["desert"]
+        )
+        Planet.objects.filter(pk=older.pk).update(updated_at=self.planet.updated_at.replace(year=2000))
+        etag = self.client.get(url)["ETag"]
+        older.delete()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("COUNT", ctx.captured_queries[0]["sql"].upper())
+
     def test_create_planet(self):
         """Test creating a new planet."""
         url = reverse("api:planet-list")
@@ -246,7 +492,10 @@ class PlanetViewSetTest(TestCase):
     def test_delete_planet(self):
         """Test deleting a planet."""
         url = reverse("api:planet-detail", args=[self.planet.id])
-        response = self.client.delete(url)
+
+        # Primary key lookup, then a single DELETE
+        with self.assertNumQueries(2):
+            response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
@@ -281,6 +530,64 @@ class PlanetViewSetTest(TestCase):
         self.assertEqual(response.data["stats"]["updated"], 2)
         mock_service_instance.sync_planets.assert_called_once()
 
+    @patch("api.views.connections")
+    @patch("api.views.threading.Thread")
+    @patch("api.views.PlanetSyncService")
+    def test_sync_planets_background(self, mock_sync_service, mock_thread, mock_connections):
+        """Test that a background sync returns 202 and cannot overlap another one."""
+        mock_service_instance = mock_sync_service.return_value
+        url = reverse("api:planet-sync-planets")
+
+        response = self.client.post(url, {"background": True}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["action"], "full_sync_queued")
+        mock_thread.assert_called_once_with(target=views._background_sync, daemon=True)
+        mock_thread.return_value.start.assert_called_once()
+        mock_service_instance.sync_planets.assert_not_called()
+
+        response = self.client.post(url, {"background": True}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        # Run the thread body here; it frees the lock for the next sync
+        views._background_sync()
+
+        mock_service_instance.sync_planets.assert_called_once_with()
+        mock_connections.close_all.assert_called_once()
+        self.assertFalse(views._sync_lock.locked())
+
+    @patch("api.views.PlanetSyncService")
+    def test_sync_planets_rejected_while_sync_running(self, mock_sync_service):
+        """Test that inline and single-planet syncs get 409 while another sync holds the lock."""
+        url = reverse("api:planet-sync-planets")
+        self.assertTrue(views._sync_lock.acquire(blocking=False))
+        self.addCleanup(views._sync_lock.release)
+
+        for data in ({}, {"planet_id": "1"}, {"background": True}):
+            with self.subTest(data=data):
+                response = self.client.post(url, data, format="json")
+                self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        mock_sync_service.return_value.sync_planets.assert_not_called()
+        mock_sync_service.return_value.sync_single_planet.assert_not_called()
+
+    @patch("api.views.threading.Thread")
+    @patch("api.views.PlanetSyncService")
+    def test_sync_planets_background_flag_parsed_as_boolean(self, mock_sync_service, mock_thread):
+        """Test that a false-like background value runs the sync inline and frees the lock."""
+        mock_sync_service.return_value.sync_planets.return_value = {"created": 0}
+        url = reverse("api:planet-sync-planets")
+
+        for data, fmt in (({"background": "false"}, "multipart"), ({"background": False}, "json")):
+            with self.subTest(data=data, fmt=fmt):
+                response = self.client.post(url, data, format=fmt)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.data["action"], "full_sync")
+                self.assertFalse(views._sync_lock.locked())
+
+        mock_thread.assert_not_called()
+
     @patch("api.views.PlanetSyncService")
     def test_sync_planets_single_planet(self, mock_sync_service):
         """Test syncing a single planet."""
@@ -362,6 +669,43 @@ class PlanetViewSetTest(TestCase):
         self.assertEqual(response.data["last_updated_planet"], "Test Planet")
         mock_service_instance.get_sync_status.assert_called_once()
 
+    @patch("api.views.PlanetSyncService")
+    def test_sync_status_cached_until_sync(self, mock_sync_service):
+        """Test that polled sync status is cached and refreshed after a sync."""
+        mock_service_instance = mock_sync_service.return_value
+        mock_service_instance.get_sync_status.side_effect = [
+            {"total_planets_in_db": 1},
+            {"total_planets_in_db": 2},
+        ]
+        mock_service_instance.sync_planets.return_value = {"created": 1}
+        url = reverse("api:planet-sync-status")
+
+        self.assertEqual(self.client.get(url).data["total_planets_in_db"], 1)
+        self.assertEqual(self.client.get(url).data["total_planets_in_db"], 1)
+        mock_service_instance.get_sync_status.assert_called_once()
+
+        self.client.post(reverse("api:planet-sync-planets"), {}, format="json")
+
+        self.assertEqual(self.client.get(url).data["total_planets_in_db"], 2)
+        self.assertEqual(mock_service_instance.get_sync_status.call_count, 2)
+
+    @patch("api.views.PlanetSyncService")
+    def test_sync_service_per_request_shares_client(self, mock_sync_service):
+        """Test that each request gets its own service but reuses the thread's GraphQL client."""
+        mock_service_instance = mock_sync_service.return_value
+        mock_service_instance.get_sync_status.return_value = {"total_planets_in_db": 1}
+        mock_service_instance.sync_planets.return_value = {"created": 0}
+
+        self.client.get(reverse("api:planet-sync-status"))
+        self.client.post(reverse("api:planet-sync-planets"), {}, format="json")
+        self.client.get(reverse("api:planet-sync-status"))
+
+        self.assertEqual(mock_sync_service.call_count, 3)
+        clients = {id(c.kwargs["client"]) for c in mock_sync_service.call_args_list}
+        self.assertEqual(len(clients), 1)
+        self.assertEqual(mock_service_instance.get_sync_status.call_count, 2)
+        mock_service_instance.sync_planets.assert_called_once()
+
     @patch("api.views.PlanetSyncService")
     @patch("api.services.sync_service.logger")
     @patch("api.views.logger")
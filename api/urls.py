@@ -1,4 +1,3 @@
-from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
 
@@ -7,6 +6,5 @@ app_name = "api"
 router = DefaultRouter()
 router.register(r'planets', views.PlanetViewSet, basename='planet')
 
-urlpatterns = [
-    path('', include(router.urls)),
-]
+# Use the router's patterns directly rather than nesting them under an empty include()
+urlpatterns = router.urls
@@ -2,18 +2,96 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from django.db.models import Q
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Max, Q
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from .models import Planet
+from .pagination import PlanetPagination, planet_list_version
 from .serializers import (
     PlanetSerializer,
     PlanetListSerializer,
+    PlanetLiteSerializer,
     PlanetCreateUpdateSerializer,
 )
+from .services.graphql_client import StarWarsGraphQLClient
 from .services.sync_service import PlanetSyncService
 import logging
+import orjson
+import threading
 
 logger = logging.getLogger(__name__)
 
+SYNC_STATUS_CACHE_KEY = "planet_sync_status"
+# Rows fetched per database round trip when streaming the planet list
+STREAM_CHUNK_SIZE = 500
+
+
+# One GraphQL client per thread: requests.Session is not safe to share between threads
+_graphql_clients = threading.local()
+
+
+def _get_sync_service():
+    """
+    Build a PlanetSyncService for the current request or sync.
+    Each service keeps its own stats; the GraphQL client, and with it the
+    pooled HTTP connections, is reused by every service on the same thread.
+    """
+    client = getattr(_graphql_clients, "client", None)
+    if client is None:
+        client = _graphql_clients.client = StarWarsGraphQLClient()
+    return PlanetSyncService(client=client)
+
+
+def _planet_list_etag(request, *args, **kwargs):
+    """
+    ETag of the planet list: changes whenever a planet is written, created or deleted.
+    Costs one MAX(updated_at) lookup on its index; creates and deletes bump the
+    cached list version. Processes must share the cache for their ETags to agree.
+    """
+    latest = Planet.objects.aggregate(latest=Max("updated_at"))["latest"]
+    return f"{planet_list_version()}-{latest.isoformat() if latest else ''}"
+
+
+def _planet_detail_etag(request, pk=None, *args, **kwargs):
+    """ETag of a single planet, derived from its updated_at; None if it does not exist."""
+    try:
+        updated_at = Planet.objects.values_list("updated_at", flat=True).get(pk=pk)
+    except (Planet.DoesNotExist, TypeError, ValueError):
+        return None
+    return updated_at.isoformat()
+
+
+def _stream_json_array(rows):
+    """Yield the rows as the chunks of one JSON array."""
+    yield b"["
+    for index, row in enumerate(rows):
+        chunk = orjson.dumps(row, option=orjson.OPT_UTC_Z)
+        yield b"," + chunk if index else chunk
+    yield b"]"
+
+
+# Held while any sync runs, inline or in the background, so syncs never overlap
+_sync_lock = threading.Lock()
+
+
+def _background_sync():
+    """
+    Run a full sync off the request thread, with a service of its own.
+    Releases the sync lock and this thread's DB connections when done.
+    """
+    try:
+        _get_sync_service().sync_planets()
+    except Exception as e:
+        logger.error("Background planet sync failed: %s", e)
+    finally:
+        cache.delete(SYNC_STATUS_CACHE_KEY)
+        connections.close_all()
+        _sync_lock.release()
+
 
 class PlanetViewSet(viewsets.ModelViewSet):
     """
@@ -23,40 +101,91 @@ class PlanetViewSet(viewsets.ModelViewSet):
 
     queryset = Planet.objects.all()
     permission_classes = [AllowAny]
+    pagination_class = PlanetPagination
+
+    # Serializer per action; other actions use PlanetSerializer
+    _SERIALIZERS = {
+        "list": PlanetListSerializer,
+        "create": PlanetCreateUpdateSerializer,
+        "update": PlanetCreateUpdateSerializer,
+        "partial_update": PlanetCreateUpdateSerializer,
+    }
 
     def get_queryset(self):
         """
         Override get_queryset to add search functionality.
         Supports searching by planet name (case-insensitive).
+        List requests only load the columns their serializer renders.
         """
         queryset = Planet.objects.all()
 
-        search = self.request.query_params.get("search", None)
+        if self.action == "list":
+            queryset = queryset.only(*self.get_serializer_class().Meta.fields)
+
+        # Blank searches match everything, so they add no WHERE clause
+        search = self.request.query_params.get("search", "").strip()
 
         if search:
+            # Served by the UPPER(name) trigram index on PostgreSQL
             queryset = queryset.filter(Q(name__icontains=search))
 
-        return queryset.order_by("name")
+        return queryset.order_by("name", "id")
+
+    @method_decorator(condition(etag_func=_planet_list_etag))
+    def list(self, request, *args, **kwargs):
+        """
+        List planets, paginated by default.
+        With ?stream=1 the whole filtered list is streamed as one JSON array
+        without pagination, holding one database chunk in memory at a time.
+        """
+        if request.query_params.get("stream", "").lower() not in ("1", "true"):
+            return super().list(request, *args, **kwargs)
+
+        fields = self.get_serializer_class().Meta.fields
+        rows = self.get_queryset().values(*fields).iterator(chunk_size=STREAM_CHUNK_SIZE)
+        return StreamingHttpResponse(_stream_json_array(rows), content_type="application/json")
+
+    @method_decorator(condition(etag_func=_planet_detail_etag))
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a planet, answering 304 Not Modified if the client's copy is current."""
+        return super().retrieve(request, *args, **kwargs)
 
     def get_serializer_class(self):
         """Return appropriate serializer class based on action."""
-        if self.action == "list":
-            return PlanetListSerializer
-        elif self.action in ["create", "update", "partial_update"]:
-            return PlanetCreateUpdateSerializer
-        return PlanetSerializer
+        if self._is_lite_list():
+            return PlanetLiteSerializer
+        return self._SERIALIZERS.get(self.action, PlanetSerializer)
+
+    def _is_lite_list(self):
+        """Check if this is a list request asking for the lite representation."""
+        request = getattr(self, "request", None)
+        return (
+            self.action == "list"
+            and request is not None
+            and request.query_params.get("lite", "").lower() in ("1", "true")
+        )
 
     @action(detail=False, methods=["POST"], url_path="sync")
     def sync_planets(self, request):
         """Trigger planet synchronization from GraphQL API."""
+        if not _sync_lock.acquire(blocking=False):
+            return Response(
+                {"error": "A planet synchronization is already running"},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        # The background thread releases the lock itself once it has started
+        handed_off = False
         try:
-            sync_service = PlanetSyncService()
+            sync_service = _get_sync_service()
 
             planet_id = request.data.get("planet_id")
+            background = str(request.data.get("background", "")).lower() in ("1", "true")
 
             if planet_id:
                 planet = sync_service.sync_single_planet(planet_id)
                 if planet:
+                    cache.delete(SYNC_STATUS_CACHE_KEY)
                     return Response(
                         {
                             "message": f"Successfully synced planet: {planet.name}",
@@ -69,8 +198,20 @@ class PlanetViewSet(viewsets.ModelViewSet):
                         {"error": f"Failed to sync planet: {planet_id}"},
                         status=status.HTTP_400_BAD_REQUEST,
                     )
+            elif background:
+                threading.Thread(target=_background_sync, daemon=True).start()
+                handed_off = True
+
+                return Response(
+                    {
+                        "message": "Planet synchronization started",
+                        "action": "full_sync_queued",
+                    },
+                    status=status.HTTP_202_ACCEPTED,
+                )
             else:
                 stats = sync_service.sync_planets()
+                cache.delete(SYNC_STATUS_CACHE_KEY)
 
                 return Response(
                     {
@@ -81,23 +222,30 @@ class PlanetViewSet(viewsets.ModelViewSet):
                 )
 
         except Exception as e:
-            logger.error(f"Error during planet sync: {e}")
+            logger.error("Error during planet sync: %s", e)
             return Response(
                 {"error": f"Sync failed: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+        finally:
+            if not handed_off:
+                _sync_lock.release()
 
     @action(detail=False, methods=["GET"], url_path="sync-status")
     def sync_status(self, request):
-        """Get current synchronization status."""
+        """Get current synchronization status, cached briefly to absorb polling."""
         try:
-            sync_service = PlanetSyncService()
-            status_data = sync_service.get_sync_status()
+            sync_service = _get_sync_service()
+            status_data = cache.get_or_set(
+                SYNC_STATUS_CACHE_KEY,
+                sync_service.get_sync_status,
+                settings.PLANET_SYNC_STATUS_CACHE_TIMEOUT,
+            )
 
             return Response(status_data)
 
         except Exception as e:
-            logger.error(f"Error fetching sync status: {e}")
+            logger.error("Error fetching sync status: %s", e)
             return Response(
                 {"error": "Failed to fetch sync status"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
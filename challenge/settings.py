@@ -87,6 +87,9 @@ if os.getenv("POSTGRES_DB"):
             "PASSWORD": os.getenv("POSTGRES_PASSWORD", "django_password"),
             "HOST": os.getenv("POSTGRES_HOST", "db"),
             "PORT": os.getenv("POSTGRES_PORT", "5432"),
+            # Keep connections open between requests instead of reconnecting each time
+            "CONN_MAX_AGE": int(os.getenv("POSTGRES_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
         }
     }
 else:
@@ -148,6 +151,21 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.AllowAny",
     ],
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
 }
+
+# Planet sync configuration
+PLANET_BULK_BATCH = int(os.getenv("PLANET_BULK_BATCH", "500"))
+# Batches at least this large are loaded with COPY on PostgreSQL
+PLANET_COPY_THRESHOLD = int(os.getenv("PLANET_COPY_THRESHOLD", "500"))
+# Seconds the unfiltered planet list count is cached between writes
+PLANET_COUNT_CACHE_TIMEOUT = int(os.getenv("PLANET_COUNT_CACHE_TIMEOUT", "30"))
+# Seconds a sync-status response is served from the cache
+PLANET_SYNC_STATUS_CACHE_TIMEOUT = int(os.getenv("PLANET_SYNC_STATUS_CACHE_TIMEOUT", "10"))